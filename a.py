@@ -1,38 +1,9 @@
 import streamlit as st
-import numpy as np
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from streamlit_option_menu import option_menu
+import profiling
+from assets import HEADER_IMAGE, HOME_IMAGE, LOGO, image_path, image_url
 
 st.set_page_config(page_title="Employee Performance", page_icon="📈", layout="wide")
 
-# Generate expanded dummy data
-np.random.seed(42)
-employees = [f"Emp_{i:03d}" for i in range(1, 21)]
-employee_names = [f"Employee {i}" for i in range(1, 21)]
-offices = ["MED-626 OH-Liberty", "MED-627 OH-Kensington", "MED-628 OH-Pittsburgh", "MED-629 OH-Beaver Falls"]
-districts = ["District 103", "District 104", "District 105", "District 106"]
-months = pd.date_range(start="2022-01", periods=12, freq="M").strftime("%Y-%m")
-
-data = {
-    "EmployeeDim[Emp Name and ID]": np.random.choice(employees, 100),
-    "EmployeeDim[Employee Name]": np.random.choice(employee_names, 100),
-    "edw v_MASTER_Office_Employee[OfficeNum & Office Name]": np.random.choice(offices, 100),
-    "edw v_MASTER_Office_Employee[District_Number]": np.random.choice(districts, 100),
-    "A_Adjusted_POS_Sales": np.random.rand(100) * 100000,
-    "A___of_Sales": np.random.rand(100) * 100,
-    "A_Commission": np.random.rand(100) * 10000,
-    "A_Discounting": np.random.rand(100) * 5000,
-    "A_Remake__": np.random.rand(100) * 3000,
-    "A_Remake_Error_": np.random.rand(100) * 500,
-    "A_Lens_Of_Choice_AR_": np.random.rand(100) * 2000,
-    "A_Lens_Of_Choice_PROG_": np.random.rand(100) * 2000,
-    "A_EO_": np.random.rand(100) * 100,
-    "Month": np.random.choice(months, 100)
-}
-
-df = pd.DataFrame(data)
 
 def login_page():
     st.sidebar.header("Login")
@@ -46,14 +17,14 @@ def login_page():
     elif login_button:
         st.sidebar.error("Please enter valid credentials.")
     st.title("MED Employee Performance Simulator")
-    st.image("./Assets/MED.jpg")
+    st.image(image_path(LOGO))
 
 def home_tab():
     st.title("MED Employee Performance Simulator")
-    img_html = """
+    img_html = f"""
     <div style="background-color: white; padding: 10px; border-radius: 15px; margin-bottom: 20px;">
     <!-- <img src="https://mms.businesswire.com/media/20240325471163/en/2076915/5/MED_logo_WSYV_blue_grey.jpg"style="width: 100%; height: auto; border-radius: 10px;" /> -->
-    <img src="https://d2q79iu7y748jz.cloudfront.net/s/_customcontent/0fd10b3309d47d6f5006b2700ba70b31"style="width: 100%; height: auto; border-radius: 10px; filter: brightness(0.8);" />
+    <img src="{image_url(HOME_IMAGE)}"style="width: 100%; height: auto; border-radius: 10px; filter: brightness(0.8);" />
     </div>
     """
     st.markdown(img_html, unsafe_allow_html=True)
@@ -61,86 +32,6 @@ def home_tab():
         st.session_state["logged_in"] = False
         st.experimental_rerun()  
     
-def perf_tab():
-    st.sidebar.title("Employee Performance Tracking Filters")
-
-    # Filters
-    employee_name = st.sidebar.text_input("Employee Name")
-    commission = st.sidebar.number_input("Commission", min_value=0, max_value=10000, value=1000, step=100)
-    discounting = st.sidebar.number_input("Discounting", min_value=0, max_value=5000, value=500, step=100)
-    remake = st.sidebar.number_input("Remake", min_value=0, max_value=3000, value=300, step=50)
-    lens_of_choice_ar = st.sidebar.number_input("Lens of Choice AR", min_value=0, max_value=3000, value=500, step=100)
-    lens_of_choice_prog = st.sidebar.number_input("Lens of Choice PROG", min_value=0, max_value=3000, value=500, step=100)
-
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        office = st.selectbox("Select Office", df["edw v_MASTER_Office_Employee[OfficeNum & Office Name]"].unique())
-    
-    with col2:
-        district = st.selectbox("Select District", df["edw v_MASTER_Office_Employee[District_Number]"].unique())
-
-    with col3:
-        month = st.selectbox("Select Month", df["Month"].unique())
-
-    # Filter data
-    filtered_data = df[
-        (df["edw v_MASTER_Office_Employee[OfficeNum & Office Name]"] == office) &
-        (df["edw v_MASTER_Office_Employee[District_Number]"] == district) &
-        (df["Month"] == month)
-    ]
-    
-    if employee_name:
-        filtered_data = filtered_data[filtered_data["EmployeeDim[Employee Name]"].str.contains(employee_name, case=False, na=False)]
-
-    st.write("Filtered Data:", filtered_data)
-
-    # Simulate Employee Performance
-    performance_simulated = filtered_data.copy()
-    performance_simulated["Simulated Commission"] = performance_simulated["A_Commission"] + commission
-    performance_simulated["Simulated Discounting"] = performance_simulated["A_Discounting"] + discounting
-    performance_simulated["Simulated Remake"] = performance_simulated["A_Remake__"] + remake
-    performance_simulated["Simulated Lens of Choice AR"] = performance_simulated["A_Lens_Of_Choice_AR_"] + lens_of_choice_ar
-    performance_simulated["Simulated Lens of Choice PROG"] = performance_simulated["A_Lens_Of_Choice_PROG_"] + lens_of_choice_prog
-    
-    # Display top employee
-    top_employee = performance_simulated.loc[performance_simulated["A___of_Sales"].idxmax(), ["EmployeeDim[Employee Name]", "A___of_Sales"]]
-    
-    col1, col2 = st.columns([3, 1])
-    with col1:
-        fig1 = go.Figure()
-        fig1.add_trace(go.Scatter(x=performance_simulated["Month"], y=performance_simulated["Simulated Commission"], 
-                                  mode='lines+markers', name="Simulated Commission", 
-                                  line=dict(color='dodgerblue', width=2)))
-        fig1.add_trace(go.Scatter(x=performance_simulated["Month"], y=performance_simulated["Simulated Discounting"], 
-                                  mode='lines+markers', name="Simulated Discounting", 
-                                  line=dict(color='royalblue', width=2)))
-        fig1.add_trace(go.Scatter(x=performance_simulated["Month"], y=performance_simulated["Simulated Remake"], 
-                                  mode='lines+markers', name="Simulated Remake", 
-                                  line=dict(color='navy', width=2)))
-        fig1.update_layout(title="Simulated Performance", xaxis_title="Month", yaxis_title="Amount", template="plotly_white")
-        st.plotly_chart(fig1)
-
-        fig2 = px.bar(performance_simulated, x="EmployeeDim[Employee Name]", 
-                      y=["Simulated Commission", "Simulated Discounting", "Simulated Remake"], 
-                      barmode="group", title="Performance Comparison", 
-                      color_discrete_map={"Simulated Commission": "dodgerblue", 
-                                          "Simulated Discounting": "royalblue", 
-                                          "Simulated Remake": "navy"})
-        st.plotly_chart(fig2)
-    
-        
-    with col2:
-        st.subheader("Top Employee")
-        st.write(f"**{top_employee['EmployeeDim[Employee Name]']}**")
-        st.write(f"Sales: {top_employee['A___of_Sales']:.2f}")
-
-    # Display simulated performance data
-    st.write("Simulated Employee Performance:", performance_simulated)
-
-    # Insights Section
-    st.subheader("Insights")
-    st.write(f"If Discounting was on Remake, then the Commission earned was highest in {month}.")
-
 def instructions_tab():
     st.title("User Instructions")
     
@@ -153,7 +44,7 @@ def instructions_tab():
     - Navigate to the **Employee Performance Simulator** tab from the top menu to begin.
     - The main components in the **Employee Performance Tracking** tab include:
         - **Filters**:
-            - Use the input fields on the sidebar to adjust values for **Commission**, **Discounting**, **Remake**, and **Lens of Choice**.
+            - Use the **Simulation Inputs** fields above the charts to adjust values for **Commission**, **Discounting**, **Remake**, and **Lens of Choice**.
             - All these fields have dummy data pre-set, which you can change to simulate different scenarios for the employee's performance.
         
         - **Select Filters**: Choose the **Office**, **District**, and **Month** from the dropdowns.
@@ -162,7 +53,7 @@ def instructions_tab():
             - The **Month** dropdown allows you to select a specific month from which to view data.
         
         - **Simulating Performance**:
-            - Once you have filtered the data based on your selections, you can simulate the employee's performance by adjusting the **Commission**, **Discounting**, **Remake**, and **Lens of Choice** values in the sidebar.
+            - Once you have filtered the data based on your selections, you can simulate the employee's performance by adjusting the **Commission**, **Discounting**, **Remake**, and **Lens of Choice** values in the **Simulation Inputs** fields. Only the simulated charts and table refresh when you change them.
             - This will calculate and display the **simulated performance** of the employee, including the simulated values for commission, discounting, and remake.
         
         - **Charts**: 
@@ -193,6 +84,7 @@ def instructions_tab():
 
 
 def main():
+    profiling.start("main", full_run=True)
     st.markdown(
         """
         <style>
@@ -209,31 +101,42 @@ def main():
         """,
         unsafe_allow_html=True
     )
-    header_html = """
+    header_html = f"""
     <div style="background-color: #0847AA; padding: 10px; border-radius: 15px; margin-bottom: 20px;">
     <!-- <img src="https://mms.businesswire.com/media/20240325471163/en/2076915/5/MED_logo_WSYV_blue_grey.jpg"style="width: 100%; height: auto; border-radius: 10px;" /> -->
-    <img src="https://media.licdn.com/dms/image/v2/C4E16AQFvv9gZE7jnnQ/profile-displaybackgroundimage-shrink_200_800/profile-displaybackgroundimage-shrink_200_800/0/1586208259986?e=2147483647&v=beta&t=n4oCq_IZQxcSc-hjVuurVBFWwLs7SPMltVkN88DI694"style="width: 100%; height: auto; border-radius: 10px;" />
+    <img src="{image_url(HEADER_IMAGE)}"style="width: 100%; height: auto; border-radius: 10px;" />
     </div>
     """
     st.markdown(header_html, unsafe_allow_html=True)
+    profiling.lap("header")
     if 'logged_in' not in st.session_state:
         st.session_state.logged_in = False
 
     if st.session_state.logged_in:
+        from streamlit_option_menu import option_menu
+
         page_options = ["Home", "Employee Performance Simulator","User Instruction"]
         selected_page = option_menu(None, page_options, icons=["house","graph-up", "info"], orientation="horizontal")
+        profiling.context(page=selected_page)
 
         if selected_page == "Home":
             home_tab()
         elif selected_page == "Employee Performance Simulator":
+            # Imported on first use: pandas, plotly and the data layer are
+            # not needed for the login page.
+            from perf_page import perf_tab
+
             perf_tab()
         elif selected_page == "User Instruction":
             instructions_tab()
     else:
         login_page()
 
+    profiling.finish("main")
+    # The admin panel is for signed-in users only, not the login page.
+    if st.session_state.logged_in:
+        profiling.render_panel()
+
 
 if __name__ == "__main__":
     main()        
-
-# ValueError: attempt to get argmax of an empty sequence
\ No newline at end of file
@@ -0,0 +1,182 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import (SALES_CATEGORICAL_COLUMNS, SALES_COLUMNS, SALES_DATA_DIR, SALES_DATA_VERSION, SQL_DATABASE,
+                         compact_frame, load_sales_data, read_parquet, sales_data_version, source_files,
+                         source_signature)
+from result_cache import new_revision
+
+METRICS = ["actual_sales", "sales_goals", "actual_cont_per", "budget_cont_per"]
+GRAINS = ["month", "quarter", "year"]
+LEVELS = ["office_name", "region"]
+
+
+def add_periods(df):
+    # Quarter and year labels are worked out once per distinct month and then
+    # spread onto the rows through the category codes, instead of slicing
+    # strings row by row.
+    months = df["month"].astype("category")
+    labels = months.cat.categories.astype(str)
+    years = labels.str[:4]
+    quarters = years + "-Q" + ((labels.str[5:7].astype(int) - 1) // 3 + 1).astype(str)
+    codes = months.cat.codes.to_numpy()
+    frame = df.copy()
+    for column, per_month in [("quarter", quarters), ("year", years)]:
+        period_codes, periods = pd.factorize(per_month)
+        frame[column] = pd.Categorical.from_codes(np.where(codes < 0, -1, period_codes[codes]), periods)
+    return frame
+
+
+def rollup(df, keys, grain):
+    # Sums and row counts instead of means, so rollups can be merged and
+    # extended exactly; the mean is always sum / count. Keys and periods come
+    # back as sorted strings, whatever categories the source used.
+    grouped = df.groupby(keys + [grain], observed=True, sort=False)
+    totals = grouped[METRICS].sum()
+    totals["count"] = grouped.size()
+    totals.index = totals.index.set_levels([level.astype(str) for level in totals.index.levels])
+    return totals.sort_index()
+
+
+def merge_rollups(totals, update):
+    # Sums and counts add up, so merging two rollups is exact. Only the groups
+    # are touched, not the rows they were built from.
+    return pd.concat([totals, update]).groupby(level=list(range(totals.index.nlevels)), sort=True).sum()
+
+
+class SalesCube:
+    # Office and region rollups of METRICS at month, quarter and year grain.
+    # Every (level, grain, key) slice is located up front, so a lookup is a
+    # dict hit plus a positional slice. levels limits the rollups built to
+    # the ones a caller reads.
+
+    def __init__(self, df, levels=LEVELS):
+        self.levels = list(levels)
+        self._keys = {level: [] for level in self.levels}
+        self._totals = {}
+        self._views = {}
+        self.append(df)
+
+    def append(self, df):
+        # Folds new rows (typically one new month) into the cube. Only the new
+        # rows are grouped; their sums and counts are merged into the existing
+        # ones, so the quarter and year that month belongs to stay exact and
+        # the rows already loaded are never read again. The new state is built
+        # on the side and swapped in, so readers never see a half update.
+        frame = add_periods(df)
+        keys = {}
+        totals = {}
+        views = {}
+        for level in self.levels:
+            known = set(self._keys[level])
+            added = [str(key) for key in frame[level].unique() if str(key) not in known]
+            keys[level] = self._keys[level] + added
+            for grain in GRAINS:
+                update = rollup(frame, [level], grain)
+                current = self._totals.get((level, grain))
+                totals[(level, grain)] = update if current is None else merge_rollups(current, update)
+                views[(level, grain)] = self._build_view(totals[(level, grain)], grain)
+        self._keys, self._totals, self._views = keys, totals, views
+        self.revision = new_revision()
+
+    def _build_view(self, totals, grain):
+        # One means frame per (level, grain), indexed by period. The rollup is
+        # sorted by key, so each key's periods are one contiguous block and a
+        # view is just a (start, stop) slice.
+        means = totals[METRICS].div(totals["count"], axis=0)
+        keys = means.index.get_level_values(0).to_numpy()
+        means.index = pd.Index(means.index.get_level_values(1), name=grain)
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.array([], dtype=np.intp)
+        stops = np.r_[starts[1:], len(keys)]
+        return means, {keys[start]: (start, stop) for start, stop in zip(starts, stops)}
+
+    def _view(self, level, key, grain):
+        means, slices = self._views[(level, grain)]
+        bounds = slices.get(key)
+        if bounds is None:
+            return None
+        return means.iloc[bounds[0]:bounds[1]]
+
+    def keys(self, level):
+        return list(self._keys[level])
+
+    def periods(self, level, key, grain):
+        view = self._view(level, key, grain)
+        return [] if view is None else list(view.index)
+
+    def frame(self, level, grain):
+        # Every key of a level at one grain as a single long frame of means.
+        totals = self._totals[(level, grain)]
+        return totals[METRICS].div(totals["count"], axis=0).reset_index()
+
+    def view(self, level, key, grain, period=None):
+        # Returns a small fresh frame with the period as a column, so callers
+        # can add columns without touching the shared cube.
+        view = self._view(level, key, grain)
+        if view is None:
+            return pd.DataFrame(columns=[grain] + METRICS)
+        if period is not None:
+            view = view.loc[view.index.intersection([period])]
+        return view.reset_index()
+
+
+class DatasetCube:
+    # A SalesCube over a Parquet dataset directory that keeps up with months
+    # appended to it (see ingest_month.py): refresh() reads only the files it
+    # has not seen yet. A file that was rewritten or removed cannot be
+    # subtracted out again, so refresh() then reports that a rebuild is needed.
+    # The files are only listed again once the dataset's signature (its marker
+    # file, see data_loader.source_signature) has changed.
+
+    def __init__(self, path):
+        self.path = path
+        self.signature = source_signature(path)
+        self.files = source_files(path)
+        self.cube = SalesCube(self._read(self.files))
+        self._lock = threading.Lock()
+
+    def _read(self, files):
+        return compact_frame(read_parquet(self.path, SALES_COLUMNS, files), SALES_CATEGORICAL_COLUMNS)
+
+    def refresh(self):
+        with self._lock:
+            signature = source_signature(self.path)
+            if signature == self.signature:
+                return True
+            files = source_files(self.path)
+            seen = set(self.files)
+            if not seen.issubset(files):
+                return False
+            added = [entry for entry in files if entry not in seen]
+            if added:
+                self.cube.append(self._read(added))
+                self.files = files
+            self.signature = signature
+            return True
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_sales_cube(version):
+    return SalesCube(load_sales_data(version))
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_dataset_cube(path, version):
+    return DatasetCube(path)
+
+
+def load_sales_cube(version=None):
+    if SQL_DATABASE:
+        import sql_backend
+
+        return sql_backend.load_sales_cube()
+    if SALES_DATA_DIR and version is None:
+        dataset = _load_dataset_cube(SALES_DATA_DIR, SALES_DATA_VERSION)
+        if not dataset.refresh():
+            _load_dataset_cube.clear()
+            dataset = _load_dataset_cube(SALES_DATA_DIR, SALES_DATA_VERSION)
+        return dataset.cube
+    return _load_sales_cube(sales_data_version() if version is None else version)
@@ -0,0 +1,110 @@
+import hashlib
+import io
+import os
+import threading
+import time
+import urllib.request
+
+import streamlit as st
+
+# The logo and the header/home banners, resized and recompressed once into
+# static/cache. Streamlit serves static/ at app/static/ (server.enableStaticServing
+# in .streamlit/config.toml), so browsers fetch each image once and cache it
+# instead of pulling the full-size originals on every visit.
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSET_CACHE_DIR = os.path.join(APP_DIR, "static", "cache")
+ASSET_CACHE_URL = "app/static/cache"
+
+LOGO = os.path.join(APP_DIR, "Assets", "MED.jpg")
+HEADER_IMAGE = ("https://media.licdn.com/dms/image/v2/C4E16AQFvv9gZE7jnnQ/profile-displaybackgroundimage-shrink_200_800/"
+                "profile-displaybackgroundimage-shrink_200_800/0/1586208259986?e=2147483647&v=beta"
+                "&t=n4oCq_IZQxcSc-hjVuurVBFWwLs7SPMltVkN88DI694")
+HOME_IMAGE = "https://d2q79iu7y748jz.cloudfront.net/s/_customcontent/0fd10b3309d47d6f5006b2700ba70b31"
+
+MAX_WIDTH = 1200
+JPEG_QUALITY = 80
+DOWNLOAD_TIMEOUT = 10
+RETRY_SECONDS = 3600
+
+_lock = threading.Lock()
+_pending = set()
+_failed = {}
+
+
+def _is_url(source):
+    return source.startswith(("http://", "https://"))
+
+
+def _cache_name(source, width):
+    # Local files are keyed by size and mtime too, so replacing one rebuilds
+    # its copy.
+    key = [source, width]
+    if not _is_url(source):
+        stat = os.stat(source)
+        key += [stat.st_size, stat.st_mtime_ns]
+    return hashlib.sha1(repr(key).encode()).hexdigest()[:16] + ".jpg"
+
+
+def _read(source):
+    if _is_url(source):
+        with urllib.request.urlopen(source, timeout=DOWNLOAD_TIMEOUT) as response:
+            return response.read()
+    with open(source, "rb") as handle:
+        return handle.read()
+
+
+def _shrink(data, width):
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data))
+    image.thumbnail((width, width * 10))
+    out = io.BytesIO()
+    image.convert("RGB").save(out, format="JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+def _build(source, width, path):
+    try:
+        data = _shrink(_read(source), width)
+        os.makedirs(ASSET_CACHE_DIR, exist_ok=True)
+        with open(path + ".tmp", "wb") as handle:
+            handle.write(data)
+        os.replace(path + ".tmp", path)
+        return True
+    except (OSError, ValueError):
+        # Remembered so an unreachable image (e.g. no network) is retried
+        # hourly instead of on every rerun.
+        _failed[path] = time.monotonic()
+        return False
+    finally:
+        with _lock:
+            _pending.discard(path)
+
+
+def cached_image(source, width=MAX_WIDTH):
+    # Path of the resized copy of source (a file or URL), or None while it is
+    # not available. Local files are resized on first use; URLs are fetched
+    # in the background so a slow download never holds up a rerun.
+    path = os.path.join(ASSET_CACHE_DIR, _cache_name(source, width))
+    if os.path.exists(path):
+        return path
+    with _lock:
+        if path in _pending or (path in _failed and time.monotonic() - _failed[path] < RETRY_SECONDS):
+            return None
+        _pending.add(path)
+    if _is_url(source):
+        threading.Thread(target=_build, args=(source, width, path), daemon=True).start()
+        return None
+    return path if _build(source, width, path) else None
+
+
+def image_path(source, width=MAX_WIDTH):
+    # For st.image: the cached copy, or the original file.
+    return cached_image(source, width) or source
+
+
+def image_url(source, width=MAX_WIDTH):
+    # For <img src> in st.markdown HTML: the cached copy when static serving
+    # is on, otherwise the original URL.
+    path = cached_image(source, width) if st.get_option("server.enableStaticServing") else None
+    return f"{ASSET_CACHE_URL}/{os.path.basename(path)}" if path else source
@@ -0,0 +1,189 @@
+"""Headless rerun benchmark for the Bonus Tier and Employee Performance tabs.
+
+Calls the functions bonus_tab() and perf_tab() run on each rerun (aggregate,
+filter, simulate, sweep or figure build, serialize) on datasets from
+generate_data.py, without a browser or Streamlit server, after one untimed
+warm-up pass. Appends one JSON line per (size, tab, stage) to the results file
+so runs can be compared across releases.
+
+    python bench.py --sizes 1000 100000 --out bench_results.jsonl
+"""
+import argparse
+import datetime
+import io
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from generate_data import generate
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000, 10_000_000]
+DEFAULT_OUT = "bench_results.jsonl"
+
+
+def serialize_frame(frame):
+    # What st.dataframe / st.write send to the browser: an Arrow IPC stream.
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.tell()
+
+
+def serialize_figures(*figures):
+    return sum(len(figure.to_json()) for figure in figures)
+
+
+def bonus_stages(df):
+    # The functions bonus_tab() runs on a rerun: one office, every time view,
+    # the simulated point and the scenario sweep for one position.
+    from aggregates import GRAINS, SalesCube
+    from bonus_page import bonus_view, simulate_bonus, sweep_figures
+
+    time_views = {"month": "Monthly", "quarter": "Quarterly", "year": "Yearly"}
+    position = "GM"
+    state = {}
+
+    def aggregate():
+        state["cube"] = SalesCube(df)
+
+    def filter_():
+        cube = state["cube"]
+        office = cube.keys("office_name")[0]
+        month = cube.periods("office_name", office, "month")[0]
+        state["selection"] = office, month
+        state["views"] = {grain: bonus_view(cube, office, grain, month) for grain in GRAINS}
+
+    def simulate():
+        state["simulated"] = [simulate_bonus(view, time_views[grain], grain, position, 50000, 40000)
+                              for grain, view in state["views"].items()]
+
+    def sweep():
+        # The undecorated function, so every run builds the figures instead
+        # of hitting st.cache_data.
+        office, month = state["selection"]
+        view = state["views"]["month"]
+        state["sweeps"] = sweep_figures.__wrapped__(office, month, (position,), float(view["actual_sales"].iloc[0]),
+                                                    float(view["sales_goals"].iloc[0]))
+
+    def serialize():
+        figures = [fig for _, _, fig, _ in state["simulated"]] + state["sweeps"]
+        return serialize_figures(*figures) + sum(serialize_frame(view.drop(columns="bonus_tier"))
+                                                 for view in state["views"].values())
+
+    return [("aggregate", aggregate), ("filter", filter_), ("simulate", simulate), ("sweep", sweep),
+            ("serialize", serialize)]
+
+
+def perf_stages(df):
+    # The functions perf_tab() runs on a rerun: the largest (office, district,
+    # month) slice searched by name, the leaderboards, the default simulation
+    # inputs, both charts and the first page of each table.
+    from data_loader import EMPLOYEE_ID_COLUMN, EMPLOYEE_NAME_COLUMN, MONTH_COLUMN
+    from perf_index import LEADERBOARD_METRICS, PerformanceIndex
+    from perf_page import simulated_charts, simulated_view
+    from scenario import ScenarioView
+    from tables import PAGE_SIZE
+
+    state = {}
+
+    def aggregate():
+        index = PerformanceIndex(df)
+        state["index"] = index
+        state["key"] = max(index.filters.keys(), key=lambda key: len(index.filters.rows(*key)))
+
+    def filter_():
+        # Searches for the first word of the slice's first name, so the name
+        # search always runs and always finds rows.
+        index = state["index"]
+        query = str(df[EMPLOYEE_NAME_COLUMN].iloc[index.rows(*state["key"])[0]]).split()[0]
+        state["filtered"] = index.select(*state["key"], employee_name=query)
+        state["leaders"] = {metric: index.top(*state["key"], metric, employee_name=query)
+                            for metric in LEADERBOARD_METRICS}
+
+    def simulate():
+        state["view"] = simulated_view(state["filtered"], 1000, 500, 300, 500, 500)
+
+    def figure():
+        state["figures"] = [fig for fig, _ in simulated_charts(state["view"])]
+
+    def serialize():
+        view = state["view"]
+        page = np.arange(min(PAGE_SIZE, len(view)))
+        columns = [EMPLOYEE_ID_COLUMN, EMPLOYEE_NAME_COLUMN, MONTH_COLUMN] + list(view.offsets)
+        return (serialize_figures(*state["figures"]) + serialize_frame(ScenarioView(state["filtered"]).frame(rows=page))
+                + serialize_frame(view.frame(columns, rows=page))
+                + sum(serialize_frame(top) for top in state["leaders"].values()))
+
+    return [("aggregate", aggregate), ("filter", filter_), ("simulate", simulate), ("figure", figure),
+            ("serialize", serialize)]
+
+
+def run_stages(stages, memory=True):
+    results = []
+    for name, stage in stages:
+        if memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        stage()
+        seconds = time.perf_counter() - started
+        peak = None
+        if memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        results.append({"stage": name, "seconds": seconds, "peak_bytes": peak})
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="dataset sizes in rows")
+    parser.add_argument("--tabs", nargs="+", choices=["bonus", "perf"], default=["bonus", "perf"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=DEFAULT_OUT, help="JSONL file the results are appended to")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip tracemalloc peak tracking (it slows the stages down)")
+    args = parser.parse_args()
+
+    context = {
+        "run_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+    }
+    builders = {"bonus": ("sales", bonus_stages), "perf": ("performance", perf_stages)}
+    with open(args.out, "a") as out:
+        for rows in args.sizes:
+            for tab in args.tabs:
+                dataset, stages = builders[tab]
+                df = generate(dataset, rows, args.seed)
+                # One untimed pass first, so one-time costs (plotly's imports
+                # and validators, first-call setup) stay out of the numbers.
+                for _, stage in stages(df):
+                    stage()
+                for result in run_stages(stages(df), memory=not args.no_memory):
+                    record = dict(context, tab=tab, rows=rows, **result)
+                    out.write(json.dumps(record) + "\n")
+                    peak = "" if result["peak_bytes"] is None else f"{result['peak_bytes'] / 2**20:10.1f} MiB"
+                    print(f"{tab:5} {rows:>11,} {result['stage']:10} {result['seconds'] * 1000:10.1f} ms {peak}")
+                del df
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+POSITIONS = ["Associate", "AGM", "GM"]
+
+# Payout in $ per bonus tier and position. Tiers that are not listed pay 0.
+BONUS_LOOKUP = {
+    0: {"Associate": 0, "AGM": 0, "GM": 0},
+    1: {"Associate": 250, "AGM": 500, "GM": 1000},
+    2: {"Associate": 300, "AGM": 600, "GM": 1200},
+    3: {"Associate": 500, "AGM": 750, "GM": 1500},
+    4: {"Associate": 800, "AGM": 1200, "GM": 2000}
+}
+
+
+class PayoutTable:
+    # BONUS_LOOKUP as a (tier x position) array, so payouts for whole columns
+    # of tiers are a single fancy-index instead of a dict .get per row.
+
+    def __init__(self, lookup=BONUS_LOOKUP, positions=POSITIONS):
+        self.positions = list(positions)
+        # A trailing zero row and zero column catch unknown tiers and positions.
+        self.amounts = np.zeros((max(lookup) + 2, len(self.positions) + 1), dtype=np.int64)
+        for tier, row in lookup.items():
+            if tier < 0:
+                continue
+            for column, position in enumerate(self.positions):
+                self.amounts[tier, column] = row.get(position, 0)
+        self._columns = {position: column for column, position in enumerate(self.positions)}
+
+    def payouts(self, tiers, positions=None):
+        # Same shape as tiers plus a trailing axis with one entry per position.
+        positions = self.positions if positions is None else list(positions)
+        tiers = np.asarray(tiers, dtype=np.int64)
+        unknown_tier = len(self.amounts) - 1
+        rows = np.where((tiers >= 0) & (tiers < unknown_tier), tiers, unknown_tier)
+        columns = np.array([self._columns.get(position, len(self.positions)) for position in positions], dtype=np.intp)
+        return self.amounts[rows[..., None], columns]
+
+    def payout(self, tiers, position):
+        return self.payouts(tiers, [position])[..., 0]
+
+
+PAYOUTS = PayoutTable()
+
+# Range and step of the "Adjust Actual Sales" / "Adjust Sales Goals" sliders.
+SALES_MIN = 20000
+SALES_MAX = 80000
+SALES_STEP = 1000
+SWEEP_VALUES = np.arange(SALES_MIN, SALES_MAX + SALES_STEP, SALES_STEP)
+
+
+def attainment(actual_sales, sales_goals):
+    # Actual sales as a percentage of goal. Works on scalars, arrays and Series.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.divide(actual_sales, sales_goals) * 100
+
+
+def bonus_tiers(actual_sales, sales_goals):
+    # Every full 100% of goal is one tier; a zero goal lands in tier 0.
+    pct = np.asarray(attainment(actual_sales, sales_goals), dtype=float)
+    with np.errstate(invalid="ignore"):
+        tiers = np.floor_divide(pct, 100)
+    return np.where(np.isfinite(tiers), tiers, 0).astype(np.int64)
+
+
+def payout_surface(actual_values=SWEEP_VALUES, goal_values=SWEEP_VALUES, positions=None, table=PAYOUTS):
+    # Tiers and payouts for every (goal, actual) pair in one batch. tiers is
+    # (goals x actuals), payouts adds a trailing axis with one entry per position.
+    actual_sales, sales_goals = np.meshgrid(actual_values, goal_values)
+    tiers = bonus_tiers(actual_sales, sales_goals)
+    return tiers, table.payouts(tiers, positions)
+
+
+def score(frame, positions=None, table=PAYOUTS):
+    # Scores every row of frame for every position in one pass. The result has
+    # one row per (input row, position) with the tier and the payout.
+    positions = table.positions if positions is None else list(positions)
+    tiers = bonus_tiers(frame["actual_sales"].to_numpy(), frame["sales_goals"].to_numpy())
+    payouts = table.payouts(tiers, positions)
+    scored = frame.loc[frame.index.repeat(len(positions))].reset_index(drop=True)
+    scored["position"] = np.tile(positions, len(frame))
+    scored["bonus_tier"] = np.repeat(tiers, len(positions))
+    scored["bonus_amount"] = payouts.ravel()
+    return scored
+
+
+def payroll_frame(cube, level="office_name", grains=("month", "quarter", "year"), positions=None):
+    # Payout for every key x period x position in the cube, all grains stacked.
+    parts = []
+    for grain in grains:
+        part = cube.frame(level, grain).rename(columns={grain: "period"})
+        part.insert(1, "grain", grain)
+        parts.append(part)
+    return score(pd.concat(parts, ignore_index=True), positions)
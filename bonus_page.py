@@ -0,0 +1,193 @@
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+import profiling
+from aggregates import load_sales_cube
+from bonus_engine import (PAYOUTS, POSITIONS, SALES_MAX, SALES_MIN, SALES_STEP, SWEEP_VALUES, attainment,
+                          bonus_tiers, payout_surface)
+from charts import FigureBuilder
+from result_cache import cached
+from st_compat import fragment
+
+# The Bonus Tier Calculation tab. app.py imports it on first use, so pandas
+# and plotly are not loaded for the login page.
+
+
+def bonus_tab():
+    cube = load_sales_cube()
+    st.sidebar.title("Bonus Tier Calculation Filters")
+
+    # Filters
+    time_view = st.sidebar.radio("Select Time View", ["Monthly", "Quarterly", "Yearly"])
+    position = st.sidebar.selectbox("Select Position", POSITIONS)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        office = st.selectbox("Select Office", cube.keys("office_name"))
+    
+    # Prepare month dropdown with human-readable format
+    filtered_months = cube.periods("office_name", office, "month")
+    formatted_months = pd.to_datetime(filtered_months).strftime("%B %Y")  # e.g., "January 2022"
+    month_mapping = dict(zip(formatted_months, filtered_months))  # Map formatted to original values
+
+    with col2:
+        # Display dropdown with formatted month names
+        selected_month = st.selectbox("Select Month", formatted_months)
+        month = month_mapping[selected_month]  # Convert back to the original format
+    profiling.context(office=office, time_view=time_view, month=month, position=position)
+    profiling.lap("filter")
+
+    # Look up the precomputed office rollup for the selected time view, with
+    # the bonus tier added; cached per filter selection for this session
+    grain = {"Monthly": "month", "Quarterly": "quarter", "Yearly": "year"}[time_view]
+    view_key = (cube.revision, office, time_view, month if time_view == "Monthly" else None)
+    data_view = cached(("bonus_view",) + view_key, lambda: bonus_view(cube, office, grain, month))
+    if data_view.empty:
+        st.warning("No data available for the selected month.")
+        return
+    profiling.lap("groupby")
+
+    # Display filtered data
+    st.write(f"Filtered Data ({time_view} View):", data_view.drop(columns="bonus_tier"))
+    profiling.lap("serialize")
+
+    bonus_simulation(data_view, office, time_view, grain, month, position, view_key)
+
+
+def bonus_view(cube, office, grain, month):
+    if grain == "month":
+        data_view = cube.view("office_name", office, grain, period=month)
+    else:
+        data_view = cube.view("office_name", office, grain)
+    # Calculate bonus tier
+    data_view["bonus_tier"] = attainment(data_view["actual_sales"], data_view["sales_goals"])
+    return data_view
+
+
+# Reruns on its own when a slider or sweep option changes, instead of the whole
+# script. Everything it depends on comes in as arguments from the last full run.
+@fragment
+def bonus_simulation(data_view, office, time_view, grain, month, position, view_key):
+    profiling.start("bonus_simulation")
+
+    # Sliders for simulation
+    col3, col4 = st.columns(2)
+    with col3:
+        actual_sales = st.slider(
+            "Adjust Actual Sales", 
+            min_value=SALES_MIN, 
+            max_value=SALES_MAX, 
+            value=int(data_view["actual_sales"].iloc[0]), 
+            step=SALES_STEP
+        )
+
+    with col4:
+        sales_goals = st.slider(
+            "Adjust Sales Goals", 
+            min_value=SALES_MIN, 
+            max_value=SALES_MAX, 
+            value=int(data_view["sales_goals"].iloc[0]), 
+            step=SALES_STEP
+        )
+
+    # Bonus statement and chart, cached per filter selection and slider values
+    simulated_bonus_tier, bonus_amount, fig, summary = cached(
+        ("bonus_simulation",) + view_key + (position, actual_sales, sales_goals),
+        lambda: simulate_bonus(data_view, time_view, grain, position, actual_sales, sales_goals))
+    profiling.context(actual_sales=actual_sales, sales_goals=sales_goals)
+    profiling.lap("figure")
+
+    # Display the bonus statement
+    st.subheader("Bonus Information")
+    st.write(f"The Bonus amount for the **{position}** with the bonus **tier {simulated_bonus_tier}** is **{bonus_amount}** $.")
+    profiling.lap("serialize")
+
+    st.plotly_chart(fig)
+    if summary:
+        st.caption(summary)
+    st.write(f"Simulated actual sales: {actual_sales}, Simulated sales goals: {sales_goals}")
+    profiling.lap("serialize")
+
+    # Scenario sweep: every slider combination at once instead of one per rerun
+    if st.checkbox("Show Scenario Sweep"):
+        sweep_positions = st.multiselect("Sweep Positions", POSITIONS, default=[position])
+        period = month if time_view == "Monthly" else time_view
+        figures = sweep_figures(office, period, tuple(sweep_positions),
+                                float(data_view["actual_sales"].iloc[0]), float(data_view["sales_goals"].iloc[0]))
+        profiling.lap("scenario")
+        for sweep_fig in figures:
+            sweep_fig.add_trace(go.Scatter(x=[actual_sales], 
+                                           y=[sales_goals], 
+                                           mode='markers', 
+                                           name='Simulated', 
+                                           marker=dict(color='darkblue', size=12, symbol='x')))
+            st.plotly_chart(sweep_fig)
+        profiling.lap("serialize")
+
+    profiling.finish("bonus_simulation")
+
+
+def simulate_bonus(data_view, time_view, grain, position, actual_sales, sales_goals):
+    # Determine bonus tier and bonus amount
+    simulated_bonus_tier = int(bonus_tiers(actual_sales, sales_goals))
+    bonus_amount = int(PAYOUTS.payout(simulated_bonus_tier, position))
+
+    # Plotting bonus tiers; the simulated tier is the same for every period
+    chart = FigureBuilder()
+    x_axis = data_view[grain]
+
+    chart.add_line(x_axis, 
+                   data_view["bonus_tier"], 
+                   mode='lines+markers', 
+                   name='Original Bonus Tier',
+                   line=dict(color='#4BD0FF'))
+    chart.add_line(x_axis, 
+                   [attainment(actual_sales, sales_goals)] * len(data_view), 
+                   mode='lines+markers', 
+                   name='Simulated Bonus Tier', 
+                   line=dict(dash='dot', color='darkblue'))
+
+    fig = chart.figure
+    fig.update_layout(title=f"Bonus Tier Simulation ({time_view} View)",
+                      xaxis_title="Time Period",
+                      yaxis_title="Bonus Tier (%)",
+                      legend_title="Bonus Tier",
+                      template="plotly_white")
+    return simulated_bonus_tier, bonus_amount, fig, chart.summary()
+
+
+# Cached per office and period; the surface itself is one batched engine call
+# covering the whole slider grid for every selected position.
+@st.cache_data(show_spinner=False, max_entries=256)
+def sweep_figures(office, period, positions, actual_sales, sales_goals):
+    tiers, payouts = payout_surface(positions=positions)
+    figures = []
+    for index, position in enumerate(positions):
+        fig = go.Figure()
+        fig.add_trace(go.Heatmap(x=SWEEP_VALUES, 
+                                 y=SWEEP_VALUES, 
+                                 z=payouts[..., index], 
+                                 customdata=tiers, 
+                                 colorscale='Blues', 
+                                 colorbar=dict(title="Bonus ($)"), 
+                                 hovertemplate="Actual: %{x}<br>Goal: %{y}<br>Tier: %{customdata}<br>Bonus: %{z} $<extra></extra>"))
+        fig.add_trace(go.Contour(x=SWEEP_VALUES, 
+                                 y=SWEEP_VALUES, 
+                                 z=tiers, 
+                                 contours=dict(coloring='lines', showlabels=True), 
+                                 line=dict(color='#0847AA', width=1), 
+                                 showscale=False, 
+                                 hoverinfo='skip', 
+                                 name='Tier'))
+        fig.add_trace(go.Scatter(x=[actual_sales], 
+                                 y=[sales_goals], 
+                                 mode='markers', 
+                                 name=f'{period} Actual', 
+                                 marker=dict(color='#4BD0FF', size=12)))
+        fig.update_layout(title=f"Bonus Sweep for {position} ({office}, {period})",
+                          xaxis_title="Actual Sales",
+                          yaxis_title="Sales Goals",
+                          template="plotly_white")
+        figures.append(fig)
+    return figures
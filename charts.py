@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Line traces with more points than this are drawn with WebGL (Scattergl).
+WEBGL_THRESHOLD = 1000
+# Line traces with more points than this are downsampled with LTTB.
+POINT_BUDGET = 2000
+# Bar charts keep this many categories and fold the rest into one "Other" bar.
+MAX_BAR_CATEGORIES = 25
+OTHER_LABEL = "Other"
+
+
+def _positions(x):
+    # LTTB needs a numeric x. Numbers and dates are used as-is, anything else
+    # (month labels, names) falls back to the row position.
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.number):
+        return x.astype(float)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return np.arange(len(x), dtype=float)
+
+
+def lttb_indices(x, y, threshold):
+    # Largest-Triangle-Three-Buckets: keeps the first and last point and, from
+    # each bucket in between, the point forming the largest triangle with the
+    # previously kept point and the mean of the next bucket. Preserves peaks
+    # and troughs far better than taking every n-th point.
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    keep = np.empty(threshold, dtype=np.intp)
+    keep[0] = 0
+    keep[-1] = n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_start, next_stop = stop, edges[bucket + 2] if bucket + 2 < len(edges) else n
+        mean_x = x[next_start:next_stop].mean()
+        mean_y = y[next_start:next_stop].mean()
+        areas = np.abs(
+            (x[previous] - mean_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (mean_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        keep[bucket + 1] = previous
+    return keep
+
+
+def top_categories(frame, category, values, max_categories=MAX_BAR_CATEGORIES):
+    # Sums values per category. Above max_categories only the largest ones (by
+    # their combined total) are kept and the rest become one OTHER_LABEL row.
+    # Returns the bucketed frame and how many categories were folded.
+    totals = frame.groupby(category, observed=True, sort=False)[values].sum()
+    totals.index = totals.index.astype(str)
+    if len(totals) <= max_categories:
+        return totals.reset_index(), 0
+    ranked = totals.sum(axis=1).sort_values(ascending=False)
+    top = totals.loc[ranked.index[:max_categories]]
+    other = totals.loc[ranked.index[max_categories:]].sum().to_frame(OTHER_LABEL).T
+    bucketed = pd.concat([top, other])
+    bucketed.index.name = category
+    return bucketed.reset_index(), len(totals) - max_categories
+
+
+class FigureBuilder:
+    # Builds a Plotly figure while keeping the payload bounded: long line
+    # traces switch to WebGL and are downsampled to the point budget, bar
+    # charts are capped to the top categories. dropped counts what was left out.
+
+    def __init__(self, point_budget=POINT_BUDGET, webgl_threshold=WEBGL_THRESHOLD,
+                 max_categories=MAX_BAR_CATEGORIES):
+        self.point_budget = point_budget
+        self.webgl_threshold = webgl_threshold
+        self.max_categories = max_categories
+        self.figure = go.Figure()
+        self.dropped_points = 0
+        self.dropped_categories = 0
+
+    def add_line(self, x, y, **trace):
+        x = np.asarray(x)
+        y = np.asarray(y, dtype=float)
+        if len(y) > self.point_budget:
+            keep = lttb_indices(_positions(x), y, self.point_budget)
+            self.dropped_points += len(y) - len(keep)
+            x, y = x[keep], y[keep]
+        trace_type = go.Scattergl if len(y) > self.webgl_threshold else go.Scatter
+        self.figure.add_trace(trace_type(x=x, y=y, **trace))
+        return self
+
+    def add_bars(self, frame, category, values, colors=None):
+        colors = colors or {}
+        bucketed, folded = top_categories(frame, category, values, self.max_categories)
+        self.dropped_categories += folded
+        for value in values:
+            self.figure.add_trace(go.Bar(x=bucketed[category], y=bucketed[value], name=value,
+                                         marker_color=colors.get(value)))
+        self.figure.update_layout(barmode="group")
+        return self
+
+    def summary(self):
+        # A short note for st.caption, or None when nothing was left out.
+        notes = []
+        if self.dropped_points:
+            notes.append(f"{self.dropped_points:,} points downsampled away")
+        if self.dropped_categories:
+            notes.append(f"{self.dropped_categories:,} categories grouped into \"{OTHER_LABEL}\"")
+        return "; ".join(notes) if notes else None
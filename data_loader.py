@@ -0,0 +1,213 @@
+import hashlib
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Bump these whenever the inline source data changes. The version is part of
+# the cache key, so every server process rebuilds its copy on the next rerun.
+SALES_DATA_VERSION = 1
+PERFORMANCE_DATA_VERSION = 1
+
+# Parquet datasets written by generate_data.py. When unset, the inline sample
+# data below is used.
+SALES_DATA_DIR = os.environ.get("MED_SALES_DATA")
+PERFORMANCE_DATA_DIR = os.environ.get("MED_PERFORMANCE_DATA")
+# Rewritten by generate_data.py and ingest_month.py whenever they change a
+# dataset, so reruns notice changes without listing every file. Datasets
+# without one are listed at most every SOURCE_CHECK_SECONDS.
+MARKER_NAME = "_updated"
+SOURCE_CHECK_SECONDS = 30
+_signatures = {}
+
+# SQLite file built by sql_backend.py. When set, filters and rollups are
+# queried from it instead of being held in memory.
+SQL_DATABASE = os.environ.get("MED_SQLITE_DB")
+
+EMPLOYEE_ID_COLUMN = "EmployeeDim[Emp Name and ID]"
+EMPLOYEE_NAME_COLUMN = "EmployeeDim[Employee Name]"
+OFFICE_COLUMN = "edw v_MASTER_Office_Employee[OfficeNum & Office Name]"
+DISTRICT_COLUMN = "edw v_MASTER_Office_Employee[District_Number]"
+MONTH_COLUMN = "Month"
+
+SALES_COLUMNS = ["region", "office_name", "sales_band", "month", "actual_sales", "sales_goals",
+                 "actual_cont_per", "budget_cont_per", "cont_per_achieve_tier"]
+PERFORMANCE_COLUMNS = [EMPLOYEE_ID_COLUMN, EMPLOYEE_NAME_COLUMN, OFFICE_COLUMN, DISTRICT_COLUMN,
+                       "A_Adjusted_POS_Sales", "A___of_Sales", "A_Commission", "A_Discounting", "A_Remake__",
+                       "A_Remake_Error_", "A_Lens_Of_Choice_AR_", "A_Lens_Of_Choice_PROG_", "A_EO_", MONTH_COLUMN]
+SALES_CATEGORICAL_COLUMNS = ["region", "office_name", "sales_band", "month", "cont_per_achieve_tier"]
+PERFORMANCE_CATEGORICAL_COLUMNS = [EMPLOYEE_ID_COLUMN, EMPLOYEE_NAME_COLUMN, OFFICE_COLUMN, DISTRICT_COLUMN, MONTH_COLUMN]
+
+
+def _sales_source():
+    return {
+        "region": ["Region 1", "Region 2", "Region 3", "Region 4"] * 24,
+        "office_name": ["Parkersburg", "Kensington", "Pittsburg", "Beaver Falls"] * 24,
+        "sales_band": ["High", "Medium", "Low", "High"] * 24,
+        "month": [
+            f"{year}-{month:02d}"
+            for year in range(2022, 2024)
+            for month in range(1, 13)
+        ] * 4,
+        "actual_sales": [
+            30000 + i * 500 for i in range(96)
+        ],
+        "sales_goals": [
+            40000 + i * 500 for i in range(96)
+        ],
+        "actual_cont_per": [75, 85, 80, 90] * 24,
+        "budget_cont_per": [80, 90, 85, 95] * 24,
+        "cont_per_achieve_tier": ["Tier 1", "Tier 2", "Tier 1", "Tier 3"] * 24
+    }
+
+
+def _performance_source():
+    # Generate expanded dummy data
+    np.random.seed(42)
+    employees = [f"Emp_{i:03d}" for i in range(1, 21)]
+    employee_names = [f"Employee {i}" for i in range(1, 21)]
+    offices = ["MED-626 OH-Liberty", "MED-627 OH-Kensington", "MED-628 OH-Pittsburgh", "MED-629 OH-Beaver Falls"]
+    districts = ["District 103", "District 104", "District 105", "District 106"]
+    months = pd.date_range(start="2022-01", periods=12, freq="M").strftime("%Y-%m")
+
+    return {
+        "EmployeeDim[Emp Name and ID]": np.random.choice(employees, 100),
+        "EmployeeDim[Employee Name]": np.random.choice(employee_names, 100),
+        "edw v_MASTER_Office_Employee[OfficeNum & Office Name]": np.random.choice(offices, 100),
+        "edw v_MASTER_Office_Employee[District_Number]": np.random.choice(districts, 100),
+        "A_Adjusted_POS_Sales": np.random.rand(100) * 100000,
+        "A___of_Sales": np.random.rand(100) * 100,
+        "A_Commission": np.random.rand(100) * 10000,
+        "A_Discounting": np.random.rand(100) * 5000,
+        "A_Remake__": np.random.rand(100) * 3000,
+        "A_Remake_Error_": np.random.rand(100) * 500,
+        "A_Lens_Of_Choice_AR_": np.random.rand(100) * 2000,
+        "A_Lens_Of_Choice_PROG_": np.random.rand(100) * 2000,
+        "A_EO_": np.random.rand(100) * 100,
+        "Month": np.random.choice(months, 100)
+    }
+
+
+def compact_frame(df, categorical_columns):
+    # Repeated labels become categoricals and integer columns are downcast,
+    # which keeps the one shared copy small.
+    df = df.copy()
+    for column in categorical_columns:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    for column in df.select_dtypes(include="integer").columns:
+        df[column] = pd.to_numeric(df[column], downcast="integer")
+    return df
+
+
+def source_files(path):
+    # (relative path, size, mtime) of every Parquet file under path, sorted.
+    entries = []
+    for root, _, files in os.walk(path):
+        for name in files:
+            if name.endswith(".parquet"):
+                stat = os.stat(os.path.join(root, name))
+                entries.append((os.path.relpath(os.path.join(root, name), path), stat.st_size, stat.st_mtime_ns))
+    return sorted(entries)
+
+
+def touch_marker(path):
+    # Called by generate_data.py and ingest_month.py after they finish writing
+    # to a dataset. pyarrow skips files starting with "_" when it reads one.
+    marker = os.path.join(path, MARKER_NAME)
+    with open(marker + ".tmp", "w") as handle:
+        handle.write(f"{time.time_ns()}\n")
+    os.replace(marker + ".tmp", marker)
+
+
+def source_signature(path):
+    # Changes whenever the dataset under path changes. Datasets written by
+    # generate_data.py / ingest_month.py have a marker file, so a check is one
+    # stat. For others every Parquet file has to be listed, so that is done
+    # at most once every SOURCE_CHECK_SECONDS per process.
+    try:
+        stat = os.stat(os.path.join(path, MARKER_NAME))
+        return f"m{stat.st_mtime_ns}-{stat.st_size}"
+    except FileNotFoundError:
+        pass
+    now = time.monotonic()
+    checked = _signatures.get(path)
+    if checked is None or now - checked[0] >= SOURCE_CHECK_SECONDS:
+        checked = now, hashlib.sha1(repr(source_files(path)).encode()).hexdigest()[:12]
+        _signatures[path] = checked
+    return checked[1]
+
+
+def sales_data_version():
+    if not SALES_DATA_DIR:
+        return str(SALES_DATA_VERSION)
+    return f"{SALES_DATA_VERSION}-{source_signature(SALES_DATA_DIR)}"
+
+
+def performance_data_version():
+    if not PERFORMANCE_DATA_DIR:
+        return str(PERFORMANCE_DATA_VERSION)
+    return f"{PERFORMANCE_DATA_VERSION}-{source_signature(PERFORMANCE_DATA_DIR)}"
+
+
+def read_parquet(path, columns, files=None):
+    # Reads a (hive-partitioned) dataset with strings straight into
+    # categoricals, so no per-row Python string objects are created. files
+    # (entries from source_files) limits the read to those files.
+    import pyarrow.dataset as ds
+
+    if files is None:
+        dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    else:
+        dataset = ds.dataset([os.path.join(path, name) for name, _, _ in files], format="parquet",
+                             partitioning="hive", partition_base_dir=path)
+    return dataset.to_table().to_pandas(strings_to_categorical=True)[columns]
+
+
+# st.cache_resource hands every session the same object instead of a pickled
+# copy per call, so callers must treat the returned frames as read-only and
+# .copy() before adding columns. max_entries=1 lets a new version replace the
+# old copy instead of keeping both.
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_sales_data(version):
+    frame = read_parquet(SALES_DATA_DIR, SALES_COLUMNS) if SALES_DATA_DIR else pd.DataFrame(_sales_source())
+    return compact_frame(frame, SALES_CATEGORICAL_COLUMNS)
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_performance_data(version):
+    if PERFORMANCE_DATA_DIR:
+        frame = read_parquet(PERFORMANCE_DATA_DIR, PERFORMANCE_COLUMNS)
+    else:
+        frame = pd.DataFrame(_performance_source())
+    return compact_frame(frame, PERFORMANCE_CATEGORICAL_COLUMNS)
+
+
+def load_sales_data(version=None):
+    return _load_sales_data(sales_data_version() if version is None else version)
+
+
+def load_performance_data(version=None):
+    return _load_performance_data(performance_data_version() if version is None else version)
+
+
+def clear_data_cache():
+    # Drops the shared copies, everything built from them (rollups, indexes,
+    # SQLite handles) and every session's cached results, so the next rerun
+    # reloads from source. Behind the admin panel's "Reload data" button; a
+    # version bump or a changed source file does the same for one dataset.
+    import sql_backend
+    from aggregates import _load_dataset_cube, _load_sales_cube
+    from perf_index import _load_performance_index
+    from result_cache import RESULTS
+
+    _load_sales_data.clear()
+    _load_performance_data.clear()
+    _load_sales_cube.clear()
+    _load_dataset_cube.clear()
+    _load_performance_index.clear()
+    sql_backend._load_sales_cube.clear()
+    sql_backend._load_performance_index.clear()
+    RESULTS.clear()
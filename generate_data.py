@@ -0,0 +1,198 @@
+"""Chunked, seedable synthetic data for the MED simulators.
+
+Streams office/district/employee/month rows in fixed-size chunks (so memory
+stays bounded at any size) and writes them as a Parquet dataset partitioned
+by month or office. Point the apps at the output with MED_SALES_DATA or
+MED_PERFORMANCE_DATA to load it in place of the inline sample data:
+
+    python generate_data.py sales --rows 10000000 --out data/sales
+    python generate_data.py performance --rows 1000000 --out data/performance --partition-by office
+
+The same --seed and --chunk-rows always produce the same rows.
+"""
+import argparse
+import math
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from data_loader import (DISTRICT_COLUMN, EMPLOYEE_ID_COLUMN, EMPLOYEE_NAME_COLUMN, MONTH_COLUMN, OFFICE_COLUMN,
+                         SALES_COLUMNS, PERFORMANCE_COLUMNS, touch_marker)
+
+CHUNK_ROWS = 500_000
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+               "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+               "Daniel", "Nancy", "Matthew", "Lisa", "Anthony", "Betty", "Mark", "Sandra", "Steven", "Ashley"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+              "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee",
+              "Thompson", "White", "Harris", "Clark", "Lewis", "Robinson", "Walker", "Young", "Allen", "King"]
+STATES = ["OH", "PA", "WV", "NY", "MI", "IN", "KY", "MD"]
+
+
+def month_labels(count, start_year=2022):
+    return [f"{start_year + index // 12}-{index % 12 + 1:02d}" for index in range(count)]
+
+
+def _chunks(rows, chunk_rows):
+    for chunk, start in enumerate(range(0, rows, chunk_rows)):
+        yield chunk, np.arange(start, min(rows, start + chunk_rows))
+
+
+def sales_chunks(rows, seed=42, chunk_rows=CHUNK_ROWS, months=24):
+    # One row per office and month, office after office. Each office keeps its
+    # region, sales band and goal level; months vary around them.
+    rng = np.random.default_rng([seed, 0])
+    month_names = month_labels(months)
+    office_count = max(4, math.ceil(rows / months))
+    offices = [f"Office {index:05d}" for index in range(office_count)]
+    regions = [f"Region {index}" for index in range(1, max(4, office_count // 25) + 1)]
+    office_region = rng.integers(0, len(regions), office_count)
+    office_goal = rng.integers(30, 70, office_count) * 1000
+    office_band = np.digitize(office_goal, [45000, 60000])
+    office_budget = rng.integers(75, 96, office_count)
+
+    for chunk, position in _chunks(rows, chunk_rows):
+        rng = np.random.default_rng([seed, chunk + 1])
+        office = (position // months) % office_count
+        month = position % months
+        goals = (office_goal[office] * rng.uniform(0.9, 1.1, len(position)) / 500).round() * 500
+        actual = (goals * rng.lognormal(0, 0.35, len(position)) / 500).round() * 500
+        actual_cont = np.clip(rng.normal(office_budget[office] - 3, 6), 40, 100).round()
+        ratio = actual_cont / office_budget[office]
+        yield pd.DataFrame({
+            "region": pd.Categorical.from_codes(office_region[office], regions),
+            "office_name": pd.Categorical.from_codes(office, offices),
+            "sales_band": pd.Categorical.from_codes(office_band[office], ["Low", "Medium", "High"]),
+            "month": pd.Categorical.from_codes(month, month_names),
+            "actual_sales": actual.astype(np.int32),
+            "sales_goals": goals.astype(np.int32),
+            "actual_cont_per": actual_cont.astype(np.int16),
+            "budget_cont_per": office_budget[office].astype(np.int16),
+            "cont_per_achieve_tier": pd.Categorical.from_codes(np.digitize(ratio, [0.95, 1.0]),
+                                                               ["Tier 1", "Tier 2", "Tier 3"]),
+        })[SALES_COLUMNS]
+
+
+def performance_chunks(rows, seed=42, chunk_rows=CHUNK_ROWS, months=12):
+    # One row per employee and month. Employees belong to one office, offices
+    # to one district, about 25 employees per office and 8 offices per district.
+    rng = np.random.default_rng([seed, 0])
+    month_names = month_labels(months)
+    employee_count = max(20, math.ceil(rows / months))
+    office_count = max(4, employee_count // 25)
+    district_count = max(4, office_count // 8)
+    offices = [f"MED-{600 + index} {STATES[index % len(STATES)]}-Office {index:05d}" for index in range(office_count)]
+    districts = [f"District {100 + index}" for index in range(district_count)]
+    office_district = rng.integers(0, district_count, office_count)
+    employee_office = rng.integers(0, office_count, employee_count)
+    first = rng.integers(0, len(FIRST_NAMES), employee_count)
+    last = rng.integers(0, len(LAST_NAMES), employee_count)
+    ids = [f"Emp_{index:07d}" for index in range(employee_count)]
+    names = [f"{FIRST_NAMES[a]} {LAST_NAMES[b]}" for a, b in zip(first, last)]
+    name_categories = sorted(set(names))
+    name_codes = pd.Categorical(names, categories=name_categories).codes
+    employee_level = rng.gamma(4.0, 12500, employee_count)
+
+    for chunk, position in _chunks(rows, chunk_rows):
+        rng = np.random.default_rng([seed, chunk + 1])
+        size = len(position)
+        employee = (position // months) % employee_count
+        office = employee_office[employee]
+        sales = employee_level[employee] * rng.lognormal(0, 0.25, size)
+        frame = pd.DataFrame({
+            EMPLOYEE_ID_COLUMN: pd.Categorical.from_codes(employee, ids),
+            EMPLOYEE_NAME_COLUMN: pd.Categorical.from_codes(name_codes[employee], name_categories),
+            OFFICE_COLUMN: pd.Categorical.from_codes(office, offices),
+            DISTRICT_COLUMN: pd.Categorical.from_codes(office_district[office], districts),
+            "A_Adjusted_POS_Sales": sales,
+            "A___of_Sales": rng.random(size) * 100,
+            "A_Commission": sales * rng.uniform(0.05, 0.12, size),
+            "A_Discounting": sales * rng.uniform(0.0, 0.06, size),
+            "A_Remake__": sales * rng.uniform(0.0, 0.04, size),
+            "A_Remake_Error_": sales * rng.uniform(0.0, 0.006, size),
+            "A_Lens_Of_Choice_AR_": rng.random(size) * 2000,
+            "A_Lens_Of_Choice_PROG_": rng.random(size) * 2000,
+            "A_EO_": rng.random(size) * 100,
+            MONTH_COLUMN: pd.Categorical.from_codes(position % months, month_names),
+        })
+        yield frame[PERFORMANCE_COLUMNS]
+
+
+def generate(dataset, rows, seed=42, chunk_rows=CHUNK_ROWS):
+    # Whole dataset in memory, for benchmarks at moderate sizes.
+    chunks = sales_chunks if dataset == "sales" else performance_chunks
+    return pd.concat(chunks(rows, seed, chunk_rows), ignore_index=True)
+
+
+def open_file_limit():
+    # Leaves headroom under the process's file descriptor limit. Above it,
+    # pyarrow closes the oldest file and starts another in that partition.
+    try:
+        import resource
+    except ImportError:
+        return 1024
+    soft = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+    return 1024 if soft == resource.RLIM_INFINITY else max(64, soft - 256)
+
+
+def plain_table(frame):
+    # Categoricals are written as plain strings: a dictionary column would
+    # carry the frame's whole category list (every employee name) into each
+    # partition file. Parquet dictionary-encodes each file's strings anyway.
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    return table.cast(pa.schema([pa.field(field.name, field.type.value_type)
+                                 if pa.types.is_dictionary(field.type) else field for field in table.schema]))
+
+
+def write_parquet(chunks, out, partition_by):
+    import pyarrow.dataset as ds
+
+    written = 0
+    for index, frame in enumerate(chunks):
+        # A chunk can span thousands of offices, far over pyarrow's default of
+        # 1024 partitions and open files, so both are sized to the chunk.
+        partitions = max(1024, frame[partition_by].nunique())
+        ds.write_dataset(plain_table(frame), out, format="parquet",
+                         partitioning=[partition_by], partitioning_flavor="hive",
+                         basename_template=f"chunk-{index:05d}-{{i}}.parquet",
+                         existing_data_behavior="overwrite_or_ignore",
+                         max_partitions=partitions, max_open_files=min(partitions, open_file_limit()))
+        written += len(frame)
+        print(f"chunk {index}: {written:,} rows written")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("dataset", choices=["sales", "performance"])
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--out", required=True, help="output directory of the Parquet dataset")
+    parser.add_argument("--partition-by", choices=["month", "office"], default="month")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--months", type=int, help="months of history per office/employee "
+                                                   "(default: 24 for sales, 12 for performance)")
+    parser.add_argument("--overwrite", action="store_true", help="replace an existing output directory")
+    args = parser.parse_args()
+
+    if os.path.exists(args.out) and os.listdir(args.out):
+        if not args.overwrite:
+            parser.error(f"{args.out} is not empty; pass --overwrite to replace it")
+        shutil.rmtree(args.out)
+
+    if args.dataset == "sales":
+        chunks = sales_chunks(args.rows, args.seed, args.chunk_rows, args.months or 24)
+        partition_by = {"month": "month", "office": "office_name"}[args.partition_by]
+    else:
+        chunks = performance_chunks(args.rows, args.seed, args.chunk_rows, args.months or 12)
+        partition_by = {"month": MONTH_COLUMN, "office": OFFICE_COLUMN}[args.partition_by]
+    write_parquet(chunks, args.out, partition_by)
+    touch_marker(args.out)
+
+
+if __name__ == "__main__":
+    main()
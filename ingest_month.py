@@ -0,0 +1,97 @@
+"""Append a new month of sales to the Parquet dataset behind MED_SALES_DATA.
+
+The rows are written as new files next to the existing ones, using the same
+partitioning, and the running apps fold them into their quarter and year
+rollups on the next rerun without rereading the history:
+
+    MED_SALES_DATA=data/sales python ingest_month.py sales_2024_01.csv
+"""
+import argparse
+import datetime
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from data_loader import SALES_CATEGORICAL_COLUMNS, SALES_COLUMNS, SALES_DATA_DIR, compact_frame, touch_marker
+from generate_data import open_file_limit, plain_table
+
+
+def read_rows(path):
+    if path.endswith(".parquet"):
+        frame = pd.read_parquet(path)
+    else:
+        frame = pd.read_csv(path, dtype={"month": str})
+    missing = [column for column in SALES_COLUMNS if column not in frame.columns]
+    if missing:
+        raise ValueError(f"{path} is missing columns: {', '.join(missing)}")
+    return compact_frame(frame[SALES_COLUMNS], SALES_CATEGORICAL_COLUMNS)
+
+
+def partition_field(path):
+    # The hive partition key of an existing dataset (e.g. "month"), if any.
+    for name in sorted(os.listdir(path)):
+        if "=" in name and os.path.isdir(os.path.join(path, name)):
+            return name.split("=", 1)[0]
+    return None
+
+
+def existing_months(path):
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+
+    months = ds.dataset(path, format="parquet", partitioning="hive").to_table(columns=["month"])["month"]
+    return {str(month) for month in pc.unique(months).to_pylist()}
+
+
+def append_rows(frame, path):
+    # Written to a staging directory first and moved in file by file, so a
+    # rerun never reads a half-written Parquet file.
+    import pyarrow.dataset as ds
+
+    field = partition_field(path)
+    # An office-partitioned dataset gets a file per office, far over
+    # pyarrow's default of 1024 partitions.
+    partitions = max(1024, frame[field].nunique() if field else 1)
+    stamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+    staging = tempfile.mkdtemp(prefix=".ingest-", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        ds.write_dataset(plain_table(frame), staging, format="parquet",
+                         partitioning=[field] if field else None, partitioning_flavor="hive" if field else None,
+                         basename_template=f"ingest-{stamp}-{{i}}.parquet",
+                         max_partitions=partitions, max_open_files=min(partitions, open_file_limit()))
+        moved = []
+        for root, _, files in os.walk(staging):
+            for name in files:
+                target = os.path.join(path, os.path.relpath(os.path.join(root, name), staging))
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(os.path.join(root, name), target)
+                moved.append(target)
+        # Only now do running apps look for the new files.
+        touch_marker(path)
+        return moved
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="CSV or Parquet file with the new month's sales rows")
+    parser.add_argument("--dataset", default=SALES_DATA_DIR, required=not SALES_DATA_DIR,
+                        help="sales Parquet dataset to append to (default: $MED_SALES_DATA)")
+    args = parser.parse_args()
+
+    frame = read_rows(args.source)
+    months = {str(month) for month in frame["month"].unique()}
+    overlap = months & existing_months(args.dataset)
+    if overlap:
+        # Months already in the rollups would be counted twice.
+        parser.error(f"{', '.join(sorted(overlap))} already in {args.dataset}")
+    for target in append_rows(frame, args.dataset):
+        print(target)
+    print(f"{len(frame):,} rows for {', '.join(sorted(months))} appended to {args.dataset}")
+
+
+if __name__ == "__main__":
+    main()
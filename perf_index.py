@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import (DISTRICT_COLUMN, EMPLOYEE_NAME_COLUMN, MONTH_COLUMN, OFFICE_COLUMN, SQL_DATABASE,
+                         load_performance_data, performance_data_version)
+from result_cache import new_revision
+
+FILTER_COLUMNS = [OFFICE_COLUMN, DISTRICT_COLUMN, MONTH_COLUMN]
+NO_ROWS = np.array([], dtype=np.intp)
+# Metrics the "Top Employee" leaderboard ranks by, with their display labels.
+LEADERBOARD_METRICS = {"A___of_Sales": "Sales", "A_Commission": "Commission", "A_Adjusted_POS_Sales": "Adjusted POS Sales"}
+TOP_K = 10
+
+
+class FilterIndex:
+    # Row positions for every observed combination of the filter columns, so a
+    # selection is a dict lookup instead of one boolean mask per column.
+
+    def __init__(self, df, columns):
+        self.columns = list(columns)
+        self._options = {column: [str(value) for value in df[column].unique()] for column in self.columns}
+        grouped = df.groupby(self.columns, observed=True, sort=False)
+        self._rows = {tuple(str(part) for part in key): rows for key, rows in grouped.indices.items()}
+
+    def options(self, column):
+        return list(self._options[column])
+
+    def keys(self):
+        return list(self._rows)
+
+    def rows(self, *key):
+        return self._rows.get(tuple(key), NO_ROWS)
+
+
+class NameIndex:
+    # Case-insensitive substring search over distinct names. Each distinct name
+    # is lower-cased once and listed under every n-gram it contains; a query
+    # only checks the names that share all of its n-grams. codes holds the
+    # name id of every row (-1 for a missing name), so a selection is narrowed
+    # to the matching names without touching rows outside it.
+
+    def __init__(self, names, n=3):
+        self.n = n
+        codes, uniques = pd.factorize(names)
+        self.codes = codes
+        self._names = [str(name).lower() for name in uniques]
+        grams = {}
+        for name_id, name in enumerate(self._names):
+            for gram in self._grams(name):
+                grams.setdefault(gram, set()).add(name_id)
+        self._grams_index = {gram: np.fromiter(ids, dtype=np.intp) for gram, ids in grams.items()}
+
+    def _grams(self, text):
+        return {text[start:start + self.n] for start in range(len(text) - self.n + 1)}
+
+    def search(self, query, among=None):
+        # Ids of the names containing query. A query shorter than n has no
+        # n-grams to narrow by, so it checks the ids in among (all names when
+        # None) one by one.
+        query = query.lower()
+        if len(query) >= self.n:
+            postings = [self._grams_index.get(gram, NO_ROWS) for gram in self._grams(query)]
+            postings.sort(key=len)
+            candidates = postings[0]
+            for posting in postings[1:]:
+                candidates = np.intersect1d(candidates, posting, assume_unique=True)
+        else:
+            candidates = range(len(self._names)) if among is None else among
+        return np.fromiter((name_id for name_id in candidates if query in self._names[name_id]), dtype=np.intp)
+
+    def filter(self, rows, query):
+        # The row positions in rows whose name contains query, in order.
+        codes = self.codes[rows]
+        among = np.unique(codes[codes >= 0]) if len(query) < self.n else None
+        return rows[np.isin(codes, self.search(query, among))]
+
+
+class Leaderboard:
+    # Row positions of the top k rows per filter key and metric, highest
+    # first. Built with one sort per metric over the whole frame; ties keep
+    # row order, like idxmax.
+
+    def __init__(self, df, columns, metrics, k=TOP_K):
+        self.k = k
+        # Group numbers follow first appearance, so each key is read off the
+        # first row of its group. ngroup() leaves rows with a missing key as
+        # NaN; they become -1 and are never ranked, like the mask filter.
+        codes = df.groupby(columns, observed=True, sort=False).ngroup().fillna(-1).to_numpy(np.intp)
+        valid = np.flatnonzero(codes >= 0)
+        first = valid[np.unique(codes[valid], return_index=True)[1]]
+        keys = [tuple(str(part) for part in key) for key in df[columns].iloc[first].itertuples(index=False)]
+        self._top = {}
+        for metric in metrics:
+            values = df[metric].to_numpy(dtype=float)
+            order = np.lexsort((-values, codes))
+            ordered = codes[order]
+            starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+            rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+            keep = (rank < k) & (ordered >= 0) & ~np.isnan(values[order])
+            kept = order[keep]
+            groups = pd.Series(kept).groupby(ordered[keep]).indices
+            self._top[metric] = {keys[code]: kept[rows] for code, rows in groups.items()}
+
+    def rows(self, metric, *key):
+        return self._top[metric].get(tuple(key), NO_ROWS)
+
+
+class PerformanceIndex:
+
+    def __init__(self, df):
+        self.df = df
+        self.filters = FilterIndex(df, FILTER_COLUMNS)
+        self.names = NameIndex(df[EMPLOYEE_NAME_COLUMN])
+        self.leaders = Leaderboard(df, FILTER_COLUMNS, LEADERBOARD_METRICS)
+        self.revision = new_revision()
+
+    def rows(self, office, district, month, employee_name=""):
+        rows = self.filters.rows(office, district, month)
+        if employee_name:
+            rows = self.names.filter(rows, employee_name)
+        return rows
+
+    def options(self, column):
+        return self.filters.options(column)
+
+    def select(self, office, district, month, employee_name=""):
+        return self.df.iloc[self.rows(office, district, month, employee_name)]
+
+    def top(self, office, district, month, metric, n=5, employee_name=""):
+        # The n best rows of the selection by metric; empty if nothing matches.
+        if employee_name:
+            # A name search leaves few rows, so rank them directly.
+            rows = self.rows(office, district, month, employee_name)
+            values = self.df[metric].to_numpy(dtype=float)[rows]
+            rows = rows[np.argsort(-values, kind="stable")][:n]
+        else:
+            rows = self.leaders.rows(metric, office, district, month)[:n]
+        top = self.df.iloc[rows][[EMPLOYEE_NAME_COLUMN, metric]]
+        return top[top[metric].notna()]
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_performance_index(version):
+    return PerformanceIndex(load_performance_data(version))
+
+
+def load_performance_index(version=None):
+    if SQL_DATABASE:
+        import sql_backend
+
+        return sql_backend.load_performance_index()
+    return _load_performance_index(performance_data_version() if version is None else version)
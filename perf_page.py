@@ -0,0 +1,148 @@
+import streamlit as st
+
+import profiling
+from charts import FigureBuilder
+from data_loader import DISTRICT_COLUMN, EMPLOYEE_ID_COLUMN, EMPLOYEE_NAME_COLUMN, MONTH_COLUMN, OFFICE_COLUMN
+from perf_index import LEADERBOARD_METRICS, load_performance_index
+from result_cache import cached
+from scenario import ScenarioView
+from st_compat import fragment
+from tables import paged_table
+
+# The Employee Performance Simulator tab. a.py imports it on first use, so
+# pandas and plotly are not loaded for the login page.
+
+
+def perf_tab():
+    index = load_performance_index()
+    st.sidebar.title("Employee Performance Tracking Filters")
+
+    # Filters
+    employee_name = st.sidebar.text_input("Employee Name")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        office = st.selectbox("Select Office", index.options(OFFICE_COLUMN))
+    
+    with col2:
+        district = st.selectbox("Select District", index.options(DISTRICT_COLUMN))
+
+    with col3:
+        month = st.selectbox("Select Month", index.options(MONTH_COLUMN))
+    profiling.context(office=office, district=district, month=month, employee_name=employee_name)
+
+    # Filter data through the prebuilt (office, district, month) and name
+    # indexes, or the SQLite backend when one is configured; cached per filter
+    # selection for this session
+    selection = (index.revision, office, district, month, employee_name)
+    filtered_data = cached(("perf_filtered",) + selection,
+                           lambda: index.select(office, district, month, employee_name))
+    profiling.lap("filter")
+
+    paged_table("Filtered Data:", filtered_data, key="filtered_data")
+    profiling.lap("serialize")
+
+    # Top employees per metric come from the prebuilt leaderboard
+    leaders = cached(("perf_leaders",) + selection,
+                     lambda: {metric: index.top(office, district, month, metric, employee_name=employee_name)
+                              for metric in LEADERBOARD_METRICS})
+    profiling.lap("groupby")
+    
+    performance_simulation(filtered_data, leaders, month, selection)
+
+
+# Reruns on its own when a simulation input changes, instead of the whole
+# script. The filtered rows and selections come in from the last full run.
+@fragment
+def performance_simulation(filtered_data, leaders, month, selection):
+    profiling.start("performance_simulation")
+    st.subheader("Simulation Inputs")
+    knob1, knob2, knob3, knob4, knob5 = st.columns(5)
+    with knob1:
+        commission = st.number_input("Commission", min_value=0, max_value=10000, value=1000, step=100)
+    with knob2:
+        discounting = st.number_input("Discounting", min_value=0, max_value=5000, value=500, step=100)
+    with knob3:
+        remake = st.number_input("Remake", min_value=0, max_value=3000, value=300, step=50)
+    with knob4:
+        lens_of_choice_ar = st.number_input("Lens of Choice AR", min_value=0, max_value=3000, value=500, step=100)
+    with knob5:
+        lens_of_choice_prog = st.number_input("Lens of Choice PROG", min_value=0, max_value=3000, value=500, step=100)
+
+    # Simulate Employee Performance; simulated columns are computed on demand
+    performance_simulated = simulated_view(filtered_data, commission, discounting, remake,
+                                           lens_of_choice_ar, lens_of_choice_prog)
+    profiling.context(commission=commission, discounting=discounting, remake=remake,
+                      lens_of_choice_ar=lens_of_choice_ar, lens_of_choice_prog=lens_of_choice_prog)
+    profiling.lap("scenario")
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        # Both charts, cached per filter selection and simulation inputs
+        charts = cached(("perf_charts",) + selection + (commission, discounting, remake),
+                        lambda: simulated_charts(performance_simulated))
+        profiling.lap("figure")
+        for fig, summary in charts:
+            st.plotly_chart(fig)
+            if summary:
+                st.caption(summary)
+        profiling.lap("serialize")
+    
+        
+    with col2:
+        st.subheader("Top Employee")
+        metric = st.selectbox("Rank By", list(LEADERBOARD_METRICS), format_func=LEADERBOARD_METRICS.get)
+        top_employees = leaders[metric]
+        if top_employees.empty:
+            st.write("No employees match the selected filters.")
+        else:
+            st.write(f"**{top_employees[EMPLOYEE_NAME_COLUMN].iloc[0]}**")
+            st.write(f"{LEADERBOARD_METRICS[metric]}: {top_employees[metric].iloc[0]:.2f}")
+            st.dataframe(top_employees.rename(columns={EMPLOYEE_NAME_COLUMN: "Employee",
+                                                       metric: LEADERBOARD_METRICS[metric]}), hide_index=True)
+
+    # Display simulated performance data
+    paged_table("Simulated Employee Performance:", performance_simulated, key="simulated_performance",
+                columns=[EMPLOYEE_ID_COLUMN, EMPLOYEE_NAME_COLUMN, MONTH_COLUMN] + list(performance_simulated.offsets))
+
+    # Insights Section
+    st.subheader("Insights")
+    st.write(f"If Discounting was on Remake, then the Commission earned was highest in {month}.")
+    profiling.lap("serialize")
+
+    profiling.finish("performance_simulation")
+
+def simulated_view(filtered_data, commission, discounting, remake, lens_of_choice_ar, lens_of_choice_prog):
+    return ScenarioView(filtered_data, {
+        "Simulated Commission": ("A_Commission", commission),
+        "Simulated Discounting": ("A_Discounting", discounting),
+        "Simulated Remake": ("A_Remake__", remake),
+        "Simulated Lens of Choice AR": ("A_Lens_Of_Choice_AR_", lens_of_choice_ar),
+        "Simulated Lens of Choice PROG": ("A_Lens_Of_Choice_PROG_", lens_of_choice_prog),
+    })
+
+
+def simulated_charts(performance_simulated):
+    line_chart = FigureBuilder()
+    line_chart.add_line(performance_simulated.column("Month"), performance_simulated.column("Simulated Commission"), 
+                        mode='lines+markers', name="Simulated Commission", 
+                        line=dict(color='dodgerblue', width=2))
+    line_chart.add_line(performance_simulated.column("Month"), performance_simulated.column("Simulated Discounting"), 
+                        mode='lines+markers', name="Simulated Discounting", 
+                        line=dict(color='royalblue', width=2))
+    line_chart.add_line(performance_simulated.column("Month"), performance_simulated.column("Simulated Remake"), 
+                        mode='lines+markers', name="Simulated Remake", 
+                        line=dict(color='navy', width=2))
+    fig1 = line_chart.figure
+    fig1.update_layout(title="Simulated Performance", xaxis_title="Month", yaxis_title="Amount", template="plotly_white")
+
+    bar_columns = ["Simulated Commission", "Simulated Discounting", "Simulated Remake"]
+    bar_chart = FigureBuilder()
+    bar_chart.add_bars(performance_simulated.frame(["EmployeeDim[Employee Name]"] + bar_columns), 
+                       "EmployeeDim[Employee Name]", bar_columns, 
+                       colors={"Simulated Commission": "dodgerblue", 
+                               "Simulated Discounting": "royalblue", 
+                               "Simulated Remake": "navy"})
+    fig2 = bar_chart.figure
+    fig2.update_layout(title="Performance Comparison", xaxis_title="Employee", yaxis_title="Amount", template="plotly_white")
+    return [(fig1, line_chart.summary()), (fig2, bar_chart.summary())]
@@ -0,0 +1,132 @@
+import datetime
+import json
+import os
+import time
+
+import streamlit as st
+
+from st_compat import rerun, session_id
+
+# Profiling is opt-in: set MED_PROFILE=1 for the whole server, or open the app
+# with ?profile=1 for a single browser session.
+PROFILE_ENV = "MED_PROFILE"
+PROFILE_LOG = os.environ.get("MED_PROFILE_LOG", "profile_log.jsonl")
+
+_ACTIVE_KEY = "_rerun_profile"
+_HISTORY_KEY = "_rerun_profiles"
+
+
+def server_enabled():
+    return os.environ.get(PROFILE_ENV, "") not in ("", "0")
+
+
+def enabled():
+    if server_enabled():
+        return True
+    params = getattr(st, "query_params", None)
+    return params is not None and params.get("profile") == "1"
+
+
+class RerunProfile:
+    # Wall time of one script run (or fragment run), split into stages with
+    # lap(): each lap charges the time since the previous one to its stage.
+
+    def __init__(self, run):
+        self.run = run
+        self.context = {}
+        self.stages = {}
+        self.started_at = datetime.datetime.now().isoformat(timespec="milliseconds")
+        self.finished = False
+        self._started = self._last = time.perf_counter()
+
+    @property
+    def total(self):
+        return sum(self.stages.values())
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def record(self):
+        return {
+            "started_at": self.started_at,
+            "session_id": session_id(),
+            "run": self.run,
+            "context": self.context,
+            "stages": self.stages,
+            "total_seconds": self.total,
+        }
+
+
+def start(run, full_run=False):
+    # main() starts a profile on every full run. A fragment started inside a
+    # full run adds its laps to that profile; on its own it gets a new one.
+    if not enabled():
+        return
+    active = st.session_state.get(_ACTIVE_KEY)
+    if full_run or active is None or active.finished or active.run == run:
+        st.session_state[_ACTIVE_KEY] = RerunProfile(run)
+
+
+def _active():
+    active = st.session_state.get(_ACTIVE_KEY)
+    return active if active is not None and not active.finished else None
+
+
+def lap(stage):
+    active = _active()
+    if active is not None:
+        active.lap(stage)
+
+
+def context(**values):
+    # Filter selections etc. stored with the timings, e.g. context(office=office).
+    active = _active()
+    if active is not None:
+        active.context.update({key: str(value) for key, value in values.items()})
+
+
+def finish(run):
+    active = _active()
+    if active is None or active.run != run:
+        return
+    active.lap("other")
+    active.finished = True
+    st.session_state.setdefault(_HISTORY_KEY, {})[run] = active
+    with open(PROFILE_LOG, "a") as log:
+        log.write(json.dumps(active.record()) + "\n")
+
+
+def render_panel():
+    if not enabled():
+        return
+    import pandas as pd
+
+    from result_cache import RESULTS
+
+    with st.expander("Admin: Rerun Profile"):
+        for run, profile in st.session_state.get(_HISTORY_KEY, {}).items():
+            st.write(f"**{run}** at {profile.started_at}: {profile.total * 1000:.1f} ms", profile.context)
+            timings = pd.DataFrame({"stage": list(profile.stages), "ms": [seconds * 1000 for seconds in profile.stages.values()]})
+            st.dataframe(timings.sort_values("ms", ascending=False), hide_index=True)
+        st.caption(f"Every profiled run is appended to {PROFILE_LOG}. Fragment reruns show up here on the next full rerun.")
+
+        st.write("**Result cache**")
+        stats = pd.DataFrame([RESULTS.session_stats(), RESULTS.stats()], index=["This session", "All sessions"])
+        stats["MiB"] = stats.pop("bytes") / 2**20
+        st.dataframe(stats)
+        st.caption(f"Caps: {RESULTS.session_max_bytes / 2**20:.0f} MiB per session, {RESULTS.max_bytes / 2**20:.0f} MiB "
+                   f"in total (MED_SESSION_RESULT_CACHE_MB / MED_RESULT_CACHE_MB).")
+
+        # Reloading rebuilds the data for every session, so it needs profiling
+        # switched on for the server, not just ?profile=1 in one browser.
+        if server_enabled():
+            st.write("**Data**")
+            if st.button("Reload data"):
+                from data_loader import clear_data_cache
+
+                clear_data_cache()
+                rerun()
+            st.caption("Drops the loaded data, rollups, indexes and cached results of every session, so the next "
+                       "rerun reads the sources again.")
@@ -0,0 +1,147 @@
+import itertools
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from st_compat import session_id
+
+# Memory caps for computed views and figures: one for every session together,
+# one for any single session.
+MAX_BYTES = int(float(os.environ.get("MED_RESULT_CACHE_MB", "256")) * 2**20)
+SESSION_MAX_BYTES = int(float(os.environ.get("MED_SESSION_RESULT_CACHE_MB", "32")) * 2**20)
+
+_revisions = itertools.count(1)
+
+
+def new_revision():
+    # A token for a loaded or updated data object, so results computed from
+    # older data never match a key again.
+    return next(_revisions)
+
+
+def _column_bytes(column):
+    # A slice of a categorical column copies the codes but shares the
+    # categories with the loaded frame, so only the codes are counted.
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.nbytes
+    return int(column.memory_usage(deep=True, index=False))
+
+
+def sizeof(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.index.memory_usage(deep=True)) + sum(_column_bytes(column) for _, column in value.items())
+    if isinstance(value, pd.Series):
+        return int(value.index.memory_usage(deep=True)) + _column_bytes(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(sizeof(item) for item in value)
+    if isinstance(value, dict):
+        return sum(sizeof(item) for item in value.values())
+    # Figures and anything else: the size of its pickle.
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class ResultCache:
+    # One LRU across all sessions, keyed by (session, key). A session over its
+    # own cap drops its least recently used results; the whole cache over its
+    # cap drops the least recently used results of any session, so results of
+    # sessions that have gone away age out on their own.
+
+    def __init__(self, max_bytes=MAX_BYTES, session_max_bytes=SESSION_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.session_max_bytes = session_max_bytes
+        self.bytes = 0
+        self.counts = {"hits": 0, "misses": 0, "evictions": 0, "too_large": 0}
+        self._entries = OrderedDict()
+        self._session_bytes = {}
+        self._session_counts = {}
+        self._lock = threading.Lock()
+
+    def _count(self, session, name):
+        self.counts[name] += 1
+        counts = self._session_counts.setdefault(session, {"hits": 0, "misses": 0})
+        if name in counts:
+            counts[name] += 1
+
+    def _drop(self, entry_key):
+        session = entry_key[0]
+        _, size = self._entries.pop(entry_key)
+        self.bytes -= size
+        remaining = self._session_bytes.pop(session) - size
+        if remaining > 0:
+            self._session_bytes[session] = remaining
+
+    def _evict(self, entry_key):
+        self._drop(entry_key)
+        self.counts["evictions"] += 1
+        if entry_key[0] not in self._session_bytes:
+            # The session's last result is gone, and with it its counters, so
+            # sessions that have ended do not pile up.
+            self._session_counts.pop(entry_key[0], None)
+
+    def get_or_compute(self, key, compute):
+        # Results are shared with later reruns, so callers must not modify
+        # what they get back.
+        session = session_id()
+        entry_key = (session, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                self._entries.move_to_end(entry_key)
+                self._count(session, "hits")
+                return entry[0]
+            self._count(session, "misses")
+        value = compute()
+        self.put(session, key, value)
+        return value
+
+    def put(self, session, key, value):
+        size = sizeof(value)
+        entry_key = (session, key)
+        with self._lock:
+            if size > self.session_max_bytes or size > self.max_bytes:
+                self.counts["too_large"] += 1
+                if session not in self._session_bytes:
+                    self._session_counts.pop(session, None)
+                return
+            if entry_key in self._entries:
+                # Another rerun of this session computed it meanwhile.
+                self._drop(entry_key)
+            self._entries[entry_key] = (value, size)
+            self.bytes += size
+            self._session_bytes[session] = self._session_bytes.get(session, 0) + size
+            while self._session_bytes.get(session, 0) > self.session_max_bytes:
+                self._evict(next(entry for entry in self._entries if entry[0] == session))
+            while self.bytes > self.max_bytes:
+                self._evict(next(iter(self._entries)))
+
+    def session_stats(self, session=None):
+        session = session_id() if session is None else session
+        with self._lock:
+            counts = dict(self._session_counts.get(session, {"hits": 0, "misses": 0}))
+            counts["entries"] = sum(1 for entry in self._entries if entry[0] == session)
+            counts["bytes"] = self._session_bytes.get(session, 0)
+            return counts
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts, entries=len(self._entries), bytes=self.bytes, sessions=len(self._session_bytes))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._session_bytes.clear()
+            self._session_counts.clear()
+            self.bytes = 0
+
+
+RESULTS = ResultCache()
+
+
+def cached(key, compute):
+    return RESULTS.get_or_compute(key, compute)
@@ -0,0 +1,50 @@
+import pandas as pd
+
+
+class ScenarioView:
+    # A base frame plus per-metric offsets from the simulation knobs. Simulated
+    # columns are only computed when a chart or table asks for them, for the
+    # rows it asks for, and the base frame is never copied or widened.
+
+    def __init__(self, base, offsets=None):
+        self.base = base
+        # simulated column name -> (source column, offset)
+        self.offsets = dict(offsets or {})
+        self._computed = {}
+
+    def __len__(self):
+        return len(self.base)
+
+    @property
+    def columns(self):
+        return list(self.base.columns) + [name for name in self.offsets if name not in self.base.columns]
+
+    def column(self, name):
+        if name not in self.offsets:
+            return self.base[name]
+        if name not in self._computed:
+            source, offset = self.offsets[name]
+            self._computed[name] = (self.base[source] + offset).rename(name)
+        return self._computed[name]
+
+    def frame(self, columns=None, rows=None):
+        # Only the requested columns, optionally only the rows at the given
+        # positions; simulated columns are derived from those rows alone.
+        columns = self.columns if columns is None else list(columns)
+        if rows is None:
+            return pd.DataFrame({name: self.column(name) for name in columns}, index=self.base.index)
+        needed = []
+        for name in columns:
+            source = self.offsets[name][0] if name in self.offsets else name
+            if source not in needed:
+                needed.append(source)
+        # Rows first: taking the columns first would copy them in full.
+        sliced = self.base.iloc[rows][needed]
+        data = {}
+        for name in columns:
+            if name in self.offsets:
+                source, offset = self.offsets[name]
+                data[name] = sliced[source] + offset
+            else:
+                data[name] = sliced[name]
+        return pd.DataFrame(data, index=sliced.index)
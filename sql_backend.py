@@ -0,0 +1,206 @@
+"""SQLite backend for the Bonus Tier and Employee Performance tabs.
+
+Loads the sales and performance data into an indexed SQLite file in chunks,
+so neither the build nor the app needs the whole dataset in memory. The apps
+use it instead of the in-memory SalesCube / PerformanceIndex when
+MED_SQLITE_DB points at the file. Filters and the month/quarter/year means
+run in SQLite and only the result rows come back:
+
+    MED_SALES_DATA=data/sales MED_PERFORMANCE_DATA=data/performance python sql_backend.py --db med.sqlite
+    MED_SQLITE_DB=med.sqlite streamlit run app.py
+"""
+import argparse
+import os
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+import streamlit as st
+
+from aggregates import GRAINS, LEVELS, METRICS, add_periods
+from data_loader import (EMPLOYEE_NAME_COLUMN, PERFORMANCE_COLUMNS, PERFORMANCE_DATA_DIR, SALES_COLUMNS,
+                         SALES_DATA_DIR, SQL_DATABASE, load_performance_data, load_sales_data)
+from perf_index import FILTER_COLUMNS, LEADERBOARD_METRICS
+from result_cache import new_revision
+
+SALES_TABLE = "sales"
+PERFORMANCE_TABLE = "performance"
+CHUNK_ROWS = 500_000
+INDEXES = {
+    SALES_TABLE: [[level, grain] for level in LEVELS for grain in GRAINS],
+    PERFORMANCE_TABLE: [FILTER_COLUMNS],
+}
+
+
+def quote(name):
+    # The EDW column names contain spaces and brackets.
+    return '"' + name.replace('"', '""') + '"'
+
+
+def query(path, sql, params=()):
+    # One short-lived read-only connection per query, so Streamlit's script
+    # threads never share a connection.
+    with closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as connection:
+        return pd.read_sql_query(sql, connection, params=params)
+
+
+def database_version(path):
+    stat = os.stat(path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+class SqlSalesCube:
+    # Same interface as aggregates.SalesCube, answered by GROUP BY queries
+    # over the indexed sales table.
+
+    def __init__(self, path):
+        self.path = path
+        self.revision = new_revision()
+        self._keys = {level: list(query(path, f"SELECT {level} FROM {SALES_TABLE} GROUP BY {level} "
+                                              f"ORDER BY MIN(rowid)")[level]) for level in LEVELS}
+
+    def _means(self, level, grain, key=None, period=None):
+        if level not in LEVELS or grain not in GRAINS:
+            raise ValueError(f"unknown level/grain: {level}/{grain}")
+        keys = [grain] if key is not None else [level, grain]
+        conditions, params = [], []
+        if key is not None:
+            conditions.append(f"{level} = ?")
+            params.append(key)
+        if period is not None:
+            conditions.append(f"{grain} = ?")
+            params.append(period)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        means = ", ".join(f"AVG({metric}) AS {metric}" for metric in METRICS)
+        return query(self.path, f"SELECT {', '.join(keys)}, {means} FROM {SALES_TABLE} {where} "
+                                f"GROUP BY {', '.join(keys)} ORDER BY {', '.join(keys)}", params)
+
+    def keys(self, level):
+        return list(self._keys[level])
+
+    def periods(self, level, key, grain):
+        return list(self._means(level, grain, key)[grain])
+
+    def frame(self, level, grain):
+        return self._means(level, grain)
+
+    def view(self, level, key, grain, period=None):
+        return self._means(level, grain, key, period)
+
+
+class SqlPerformanceIndex:
+    # Same interface as perf_index.PerformanceIndex. select() runs in SQLite
+    # on the (office, district, month) index and keeps the row order and row
+    # labels of the in-memory frame.
+
+    def __init__(self, path):
+        self.path = path
+        self.revision = new_revision()
+        self._options = {column: list(query(path, f"SELECT {quote(column)} FROM {PERFORMANCE_TABLE} "
+                                                  f"GROUP BY {quote(column)} ORDER BY MIN(rowid)")[column])
+                         for column in FILTER_COLUMNS}
+        # SQLite hands back untyped columns for an empty result, so keep the
+        # column types of a real row to apply to every selection.
+        self._columns = ", ".join(quote(column) for column in PERFORMANCE_COLUMNS)
+        self._dtypes = query(path, f"SELECT {self._columns} FROM {PERFORMANCE_TABLE} LIMIT 1").dtypes
+
+    def options(self, column):
+        return list(self._options[column])
+
+    def _where(self, office, district, month, employee_name):
+        conditions = [f"{quote(column)} = ?" for column in FILTER_COLUMNS]
+        params = [office, district, month]
+        if employee_name:
+            # Literal, case-insensitive substring match like NameIndex.search.
+            conditions.append(f"instr(lower({quote(EMPLOYEE_NAME_COLUMN)}), lower(?)) > 0")
+            params.append(employee_name)
+        return " AND ".join(conditions), params
+
+    def select(self, office, district, month, employee_name=""):
+        where, params = self._where(office, district, month, employee_name)
+        frame = query(self.path, f"SELECT rowid - 1 AS row_id, {self._columns} FROM {PERFORMANCE_TABLE} "
+                                 f"WHERE {where} ORDER BY rowid", params)
+        return frame.set_index("row_id").rename_axis(None).astype(self._dtypes)
+
+    def top(self, office, district, month, metric, n=5, employee_name=""):
+        if metric not in LEADERBOARD_METRICS:
+            raise ValueError(f"unknown leaderboard metric: {metric}")
+        where, params = self._where(office, district, month, employee_name)
+        frame = query(self.path, f"SELECT rowid - 1 AS row_id, {quote(EMPLOYEE_NAME_COLUMN)}, {metric} "
+                                 f"FROM {PERFORMANCE_TABLE} WHERE {where} AND {metric} IS NOT NULL "
+                                 f"ORDER BY {metric} DESC, rowid LIMIT ?", params + [n])
+        return frame.set_index("row_id").rename_axis(None).astype(self._dtypes[frame.columns[1:]])
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_sales_cube(path, version):
+    return SqlSalesCube(path)
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_performance_index(path, version):
+    return SqlPerformanceIndex(path)
+
+
+def load_sales_cube(path=SQL_DATABASE):
+    return _load_sales_cube(path, database_version(path))
+
+
+def load_performance_index(path=SQL_DATABASE):
+    return _load_performance_index(path, database_version(path))
+
+
+def source_chunks(directory, columns, load, chunk_rows):
+    # Parquet datasets are read batch by batch; the inline sample data is
+    # small enough to load whole.
+    if not directory:
+        yield load()
+        return
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(directory, format="parquet", partitioning="hive")
+    for batch in dataset.to_batches(batch_size=chunk_rows):
+        if batch.num_rows:
+            yield pa.Table.from_batches([batch]).to_pandas()[columns]
+
+
+def write_table(connection, table, chunks):
+    written = 0
+    for chunk in chunks:
+        chunk = chunk.astype({column: str for column in chunk.select_dtypes(include="category").columns})
+        chunk.to_sql(table, connection, if_exists="replace" if written == 0 else "append", index=False)
+        written += len(chunk)
+        print(f"{table}: {written:,} rows")
+    for number, columns in enumerate(INDEXES[table]):
+        connection.execute(f"CREATE INDEX {table}_{number} ON {table} ({', '.join(quote(c) for c in columns)})")
+    return written
+
+
+def build(path, chunk_rows=CHUNK_ROWS):
+    # Builds next to the target and swaps it in, so running apps keep reading
+    # the old file until the new one is complete.
+    building = path + ".building"
+    if os.path.exists(building):
+        os.remove(building)
+    with closing(sqlite3.connect(building)) as connection:
+        sales = source_chunks(SALES_DATA_DIR, SALES_COLUMNS, load_sales_data, chunk_rows)
+        write_table(connection, SALES_TABLE, (add_periods(chunk) for chunk in sales))
+        performance = source_chunks(PERFORMANCE_DATA_DIR, PERFORMANCE_COLUMNS, load_performance_data, chunk_rows)
+        write_table(connection, PERFORMANCE_TABLE, performance)
+        connection.execute("ANALYZE")
+        connection.commit()
+    os.replace(building, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=SQL_DATABASE, required=not SQL_DATABASE,
+                        help="SQLite file to (re)build (default: $MED_SQLITE_DB)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+    build(args.db, args.chunk_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import streamlit as st
+
+# st.fragment is st.experimental_fragment on releases before 1.37. Without
+# either, the decorated function just runs as part of the full rerun.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+# st.rerun is st.experimental_rerun on releases before 1.27.
+rerun = getattr(st, "rerun", None) or getattr(st, "experimental_rerun")
+
+
+def session_id():
+    # The browser session the current script run belongs to; None outside a
+    # Streamlit server (bare scripts, bench.py).
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else None
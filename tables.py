@@ -0,0 +1,60 @@
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from scenario import ScenarioView
+
+PAGE_SIZE = 50
+
+
+def filter_positions(view, positions, column, text):
+    # Positions whose column value contains text (case-insensitive, literal).
+    values = pd.Series(view.column(column).to_numpy()[positions]).astype(str)
+    return positions[values.str.contains(text, case=False, regex=False).to_numpy()]
+
+
+def sort_positions(view, positions, column, descending=False):
+    values = pd.Series(view.column(column).to_numpy()[positions])
+    order = values.sort_values(ascending=not descending, kind="stable", na_position="last").index
+    return positions[order.to_numpy()]
+
+
+def paged_table(label, source, key, columns=None, page_size=PAGE_SIZE):
+    # Sorting, filtering and paging happen on row positions server-side; only
+    # the current page of the selected columns is materialised and sent to the
+    # browser. source can be a DataFrame or a ScenarioView.
+    view = source if isinstance(source, ScenarioView) else ScenarioView(source)
+    all_columns = view.columns
+    st.write(label)
+
+    with st.expander("Table Options"):
+        shown = st.multiselect("Columns", all_columns, default=columns or all_columns, key=f"{key}_columns")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            sort_column = st.selectbox("Sort By", [None] + shown, format_func=lambda c: "—" if c is None else c,
+                                       key=f"{key}_sort")
+            descending = st.checkbox("Descending", key=f"{key}_descending")
+        with col2:
+            filter_column = st.selectbox("Filter Column", shown, key=f"{key}_filter_column")
+        with col3:
+            filter_text = st.text_input("Contains", key=f"{key}_filter_text")
+
+    positions = np.arange(len(view))
+    if filter_text and filter_column:
+        positions = filter_positions(view, positions, filter_column, filter_text)
+    if sort_column:
+        positions = sort_positions(view, positions, sort_column, descending)
+
+    total = len(positions)
+    pages = max(1, math.ceil(total / page_size))
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page")
+    start = (page - 1) * page_size
+    window = positions[start:start + page_size]
+
+    st.dataframe(view.frame(shown, rows=window))
+    shown_rows = f"Rows {start + 1:,}–{start + len(window):,} of {total:,}" if total else "No rows"
+    if total != len(view):
+        shown_rows += f" (filtered from {len(view):,})"
+    st.caption(shown_rows)